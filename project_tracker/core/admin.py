@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import StudentProfile, FacultyProfile, Project, ProjectReport
+from .models import (
+    StudentProfile, FacultyProfile, Project, ProjectReport, NotificationOutbox,
+    ArchivedProject, ArchivedProjectReport, ReviewEvent,
+)
 
 
 @admin.register(StudentProfile)
@@ -8,8 +11,8 @@ class StudentProfileAdmin(admin.ModelAdmin):
     Django admin configuration for StudentProfile.
     Displays student information in a user-friendly format.
     """
-    list_display = ('user', 'register_number', 'department', 'year', 'created_at')
-    list_filter = ('department', 'year', 'created_at')
+    list_display = ('user', 'register_number', 'department', 'year', 'graduated', 'created_at')
+    list_filter = ('department', 'year', 'graduated', 'created_at')
     search_fields = ('user__username', 'register_number', 'department')
     readonly_fields = ('created_at', 'updated_at')
 
@@ -18,7 +21,7 @@ class StudentProfileAdmin(admin.ModelAdmin):
             'fields': ('user',)
         }),
         ('Student Details', {
-            'fields': ('register_number', 'department', 'year')
+            'fields': ('register_number', 'department', 'year', 'graduated')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -43,7 +46,7 @@ class FacultyProfileAdmin(admin.ModelAdmin):
             'fields': ('user',)
         }),
         ('Faculty Details', {
-            'fields': ('employee_id', 'department', 'designation')
+            'fields': ('employee_id', 'department', 'designation', 'max_open_reviews')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -64,3 +67,59 @@ class ProjectAdmin(admin.ModelAdmin):
 class ProjectReportAdmin(admin.ModelAdmin):
     list_display = ('project', 'generated_by', 'generated_at')
     readonly_fields = ('generated_at',)
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipient', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'recipient__username')
+    readonly_fields = ('created_at', 'sent_at')
+
+
+class ArchivedProjectReportInline(admin.TabularInline):
+    model = ArchivedProjectReport
+    extra = 0
+    can_delete = False
+    readonly_fields = ('original_id', 'generated_by_username', 'generated_at', 'pdf_file', 'notes')
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedProject)
+class ArchivedProjectAdmin(admin.ModelAdmin):
+    """
+    Archived projects are read-only; they are created by
+    `manage.py archive_projects`.
+    """
+    list_display = ('title', 'student_register_number', 'department', 'status', 'submitted_at', 'archived_at')
+    list_filter = ('status', 'department')
+    search_fields = ('title', 'student_register_number', 'student_username')
+    inlines = [ArchivedProjectReportInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ReviewEvent)
+class ReviewEventAdmin(admin.ModelAdmin):
+    """Review history is append-only."""
+    list_display = ('project_id', 'faculty', 'status', 'source', 'reviewed_at')
+    list_filter = ('status', 'source')
+    date_hierarchy = 'reviewed_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
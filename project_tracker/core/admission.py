@@ -0,0 +1,183 @@
+"""
+Admission control for expensive endpoints.
+
+Each endpoint listed in settings.ADMISSION_CONTROL gets:
+- a concurrency limit: at most `concurrency` requests run at once across all
+  workers, enforced with leased slot keys in the shared admission cache;
+- a per-user token bucket refilling at `rate` requests/second up to `burst`.
+
+Requests over either limit are turned away immediately (503 / 429 with
+Retry-After) instead of queueing behind the busy workers, so cheap pages
+keep their latency during surges. The token bucket is read-modify-write,
+so concurrent requests of one user may overshoot it by a request or two;
+the concurrency limit uses atomic cache.add() and is exact.
+
+Rejections must stay cheap: a busy endpoint is detected with one read of
+all slot keys before any add() is attempted, and counters are buffered in
+memory and added to the AdmissionCounter rows with atomic updates at most
+every ADMISSION_METRICS_FLUSH_SECONDS per worker. Counts are exact but
+lag by up to that interval.
+"""
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.http import HttpResponse
+
+from .models import AdmissionCounter
+
+METRICS = ('admitted', 'rejected_busy', 'rejected_rate')
+
+
+def _cache():
+    return caches[settings.ADMISSION_CACHE_ALIAS]
+
+
+def _key(endpoint, *parts):
+    return ':'.join(('admission', endpoint) + tuple(str(p) for p in parts))
+
+
+# (endpoint, metric) -> increments not yet written to AdmissionCounter
+_pending = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+def record(endpoint, metric):
+    with _pending_lock:
+        _pending[(endpoint, metric)] += 1
+        due = time.monotonic() - _last_flush >= settings.ADMISSION_METRICS_FLUSH_SECONDS
+    if due:
+        flush_metrics()
+
+
+def flush_metrics():
+    """Add this worker's buffered counts to the AdmissionCounter rows."""
+    global _last_flush
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    for (endpoint, metric), count in pending.items():
+        counters = AdmissionCounter.objects.filter(endpoint=endpoint, metric=metric)
+        if counters.update(count=F('count') + count):
+            continue
+        try:
+            with transaction.atomic():
+                AdmissionCounter.objects.create(endpoint=endpoint, metric=metric, count=count)
+        except IntegrityError:
+            # another worker created the row first
+            counters.update(count=F('count') + count)
+
+
+def acquire_slot(endpoint, concurrency, lease_seconds):
+    """
+    Claim one of `concurrency` slots, or return None when all are taken.
+    Slots expire after `lease_seconds` so a crashed worker cannot leak one.
+    """
+    cache = _cache()
+    keys = [_key(endpoint, 'slot', i) for i in range(concurrency)]
+    # one read decides the common busy case without any failing writes
+    taken = cache.get_many(keys)
+    free = [key for key in keys if key not in taken]
+    random.shuffle(free)
+    token = uuid.uuid4().hex
+    for key in free:
+        if cache.add(key, token, timeout=lease_seconds):
+            return key, token
+    return None
+
+
+def release_slot(slot):
+    cache = _cache()
+    key, token = slot
+    # only free the slot if our lease has not expired and been re-issued
+    if cache.get(key) == token:
+        cache.delete(key)
+
+
+def take_token(endpoint, user_key, rate, burst):
+    """Spend one token from the user's bucket. Returns (allowed, retry_after_seconds)."""
+    cache = _cache()
+    key = _key(endpoint, 'bucket', user_key)
+    now = time.time()
+    tokens, updated = cache.get(key, (burst, now))
+    tokens = min(burst, tokens + (now - updated) * rate)
+    if tokens < 1:
+        return False, (1 - tokens) / rate
+    # keep the bucket around until it would have refilled anyway
+    cache.set(key, (tokens - 1, now), timeout=int(burst / rate) + 1)
+    return True, 0
+
+
+def in_flight(endpoint, concurrency):
+    """Number of requests currently holding a slot."""
+    keys = [_key(endpoint, 'slot', i) for i in range(concurrency)]
+    return len(_cache().get_many(keys))
+
+
+def stats(endpoint):
+    flush_metrics()
+    policy = settings.ADMISSION_CONTROL.get(endpoint, {})
+    values = dict(AdmissionCounter.objects.filter(endpoint=endpoint).values_list('metric', 'count'))
+    result = {m: values.get(m, 0) for m in METRICS}
+    result['in_flight'] = in_flight(endpoint, policy.get('concurrency', 0))
+    result['concurrency'] = policy.get('concurrency')
+    return result
+
+
+def reset_stats(endpoint):
+    flush_metrics()
+    AdmissionCounter.objects.filter(endpoint=endpoint).delete()
+
+
+def _reject(status, message, retry_after):
+    response = HttpResponse(message, status=status, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return response
+
+
+def admission_control(endpoint):
+    """Decorator applying the ADMISSION_CONTROL policy named `endpoint`.
+
+    Usage:
+        @group_required('Faculty')
+        @admission_control('generate_report')
+        def view(...):
+            ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            policy = settings.ADMISSION_CONTROL.get(endpoint)
+            if not policy:
+                return view_func(request, *args, **kwargs)
+
+            if policy.get('rate'):
+                user_key = request.user.pk if request.user.is_authenticated else request.META.get('REMOTE_ADDR')
+                allowed, retry_after = take_token(endpoint, user_key, policy['rate'], policy.get('burst', 1))
+                if not allowed:
+                    record(endpoint, 'rejected_rate')
+                    return _reject(429, 'Too many requests. Please slow down.', retry_after)
+
+            slot = acquire_slot(endpoint, policy['concurrency'], policy.get('lease_seconds', 60))
+            if slot is None:
+                record(endpoint, 'rejected_busy')
+                return _reject(503, 'Server busy. Please try again shortly.', policy.get('retry_after', 5))
+
+            record(endpoint, 'admitted')
+            try:
+                return view_func(request, *args, **kwargs)
+            finally:
+                release_slot(slot)
+
+        return _wrapped
+
+    return decorator
@@ -0,0 +1,539 @@
+"""
+Lightweight JSON API for projects, reports and profiles.
+
+Every resource carries a strong ETag derived from its version columns
+(`updated_at`, or `generated_at` for reports), computed before any row is
+serialized, so clients polling with If-None-Match get a 304 for the cost of
+one narrow query. Lists use cursor pagination and `?fields=` selection.
+"""
+import base64
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.forms import modelform_factory
+from django.http import JsonResponse, QueryDict
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_http_methods
+
+from . import changefeed, reviews
+from .assignment import assign_reviewer, in_department, review_queue
+from .decorators import api_group_required
+from .forms import ProjectReviewForm, ProjectSubmissionForm
+from .models import ArchivedProject, FacultyProfile, Project, ProjectReport, ReviewEvent, StudentProfile
+from .similarity import index_project
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class APIError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _file_url(field):
+    return field.url if field else None
+
+
+# Serializable fields: name -> (model columns needed, getter)
+PROJECT_FIELDS = {
+    'id': (['id'], lambda p: p.id),
+    'title': (['title'], lambda p: p.title),
+    'domain': (['domain'], lambda p: p.domain),
+    'description': (['description'], lambda p: p.description),
+    'status': (['status'], lambda p: p.status),
+    'student': (['student'], lambda p: p.student_id),
+    'faculty_reviewer': (['faculty_reviewer'], lambda p: p.faculty_reviewer_id),
+    'faculty_remarks': (['faculty_remarks'], lambda p: p.faculty_remarks),
+    'attachment': (['attachment'], lambda p: _file_url(p.attachment)),
+    'submitted_at': (['submitted_at'], lambda p: _iso(p.submitted_at)),
+    'reviewed_at': (['reviewed_at'], lambda p: _iso(p.reviewed_at)),
+    'updated_at': (['updated_at'], lambda p: _iso(p.updated_at)),
+}
+
+REPORT_FIELDS = {
+    'id': (['id'], lambda r: r.id),
+    'project': (['project'], lambda r: r.project_id),
+    'generated_by': (['generated_by'], lambda r: r.generated_by_id),
+    'generated_at': (['generated_at'], lambda r: _iso(r.generated_at)),
+    'pdf_file': (['pdf_file'], lambda r: _file_url(r.pdf_file)),
+    'notes': (['notes'], lambda r: r.notes),
+}
+
+STUDENT_FIELDS = {
+    'id': (['id'], lambda s: s.id),
+    'username': (['user__username'], lambda s: s.user.username),
+    'email': (['user__email'], lambda s: s.user.email),
+    'register_number': (['register_number'], lambda s: s.register_number),
+    'department': (['department'], lambda s: s.department),
+    'year': (['year'], lambda s: s.year),
+    'updated_at': (['updated_at'], lambda s: _iso(s.updated_at)),
+}
+
+FACULTY_FIELDS = {
+    'id': (['id'], lambda f: f.id),
+    'username': (['user__username'], lambda f: f.user.username),
+    'email': (['user__email'], lambda f: f.user.email),
+    'employee_id': (['employee_id'], lambda f: f.employee_id),
+    'department': (['department'], lambda f: f.department),
+    'designation': (['designation'], lambda f: f.designation),
+    'max_open_reviews': (['max_open_reviews'], lambda f: f.max_open_reviews),
+    'updated_at': (['updated_at'], lambda f: _iso(f.updated_at)),
+}
+
+ARCHIVED_PROJECT_FIELDS = {
+    'id': (['id'], lambda a: a.id),
+    'original_id': (['original_id'], lambda a: a.original_id),
+    'student_register_number': (['student_register_number'], lambda a: a.student_register_number),
+    'student_username': (['student_username'], lambda a: a.student_username),
+    'department': (['department'], lambda a: a.department),
+    'title': (['title'], lambda a: a.title),
+    'domain': (['domain'], lambda a: a.domain),
+    'description': (['description'], lambda a: a.description),
+    'status': (['status'], lambda a: a.status),
+    'faculty_reviewer_username': (['faculty_reviewer_username'], lambda a: a.faculty_reviewer_username),
+    'faculty_remarks': (['faculty_remarks'], lambda a: a.faculty_remarks),
+    'attachment': (['attachment'], lambda a: _file_url(a.attachment)),
+    'submitted_at': (['submitted_at'], lambda a: _iso(a.submitted_at)),
+    'reviewed_at': (['reviewed_at'], lambda a: _iso(a.reviewed_at)),
+    'archived_at': (['archived_at'], lambda a: _iso(a.archived_at)),
+    'reports': ([], lambda a: [
+        {
+            'original_id': r.original_id,
+            'generated_by': r.generated_by_username,
+            'generated_at': _iso(r.generated_at),
+            'pdf_file': _file_url(r.pdf_file),
+            'notes': r.notes,
+        }
+        for r in a.reports.all()
+    ]),
+}
+
+REVIEW_EVENT_FIELDS = {
+    'id': (['id'], lambda e: e.id),
+    'project': (['project'], lambda e: e.project_id),
+    'faculty': (['faculty'], lambda e: e.faculty_id),
+    'status': (['status'], lambda e: e.status),
+    'remarks': (['remarks'], lambda e: e.remarks),
+    'reviewed_at': (['reviewed_at'], lambda e: _iso(e.reviewed_at)),
+    'source': (['source'], lambda e: e.source),
+}
+
+# Columns that change whenever a row's representation changes
+PROJECT_VERSION = ('updated_at',)
+REPORT_VERSION = ('generated_at', 'pdf_file')
+PROFILE_VERSION = ('updated_at',)
+# Archived rows are never modified after archival
+ARCHIVE_VERSION = ('archived_at',)
+
+# Fields a user may change on their own profile
+STUDENT_EDITABLE = ['department', 'year']
+FACULTY_EDITABLE = ['department', 'designation']
+
+
+# ========== HELPERS ==========
+
+def _selected_fields(request, spec):
+    raw = request.GET.get('fields')
+    if not raw:
+        return list(spec)
+    names = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in names if name not in spec]
+    if unknown:
+        raise APIError(f"Unknown field(s): {', '.join(unknown)}")
+    return names
+
+
+def _columns(spec, names):
+    columns = {'id'}
+    for name in names:
+        columns.update(spec[name][0])
+    return sorted(columns)
+
+
+def _serialize(obj, spec, names):
+    return {name: spec[name][1](obj) for name in names}
+
+
+def _make_etag(*parts):
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def _encode_cursor(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip('=')
+
+
+def _decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise APIError('Invalid cursor.')
+
+
+def _page_size(request):
+    try:
+        size = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise APIError('limit must be an integer.')
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def _json_response(request, payload, etag, status=200):
+    response = JsonResponse(payload, status=status)
+    response['ETag'] = etag
+    # clients may cache, but must revalidate with If-None-Match each time
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            raise APIError('Request body is not valid JSON.')
+        if not isinstance(data, dict):
+            raise APIError('Request body must be a JSON object.')
+        return data
+    if request.method == 'POST':
+        return request.POST
+    # Django only parses form bodies for POST; anything else would be ignored
+    if request.content_type == 'application/x-www-form-urlencoded':
+        return QueryDict(request.body, encoding=request.encoding)
+    raise APIError('Send the request body as JSON or form-encoded data.', status=415)
+
+
+def _current_profile(request):
+    """Return ('Student'|'Faculty', profile) for the requesting user."""
+    user = request.user
+    if user.groups.filter(name='Student').exists():
+        profile = StudentProfile.objects.filter(user=user).first()
+        if profile:
+            return 'Student', profile
+    if user.groups.filter(name='Faculty').exists():
+        profile = FacultyProfile.objects.filter(user=user).first()
+        if profile:
+            return 'Faculty', profile
+    raise APIError('Profile not found.', status=403)
+
+
+def _scoped_projects(role, profile):
+    if role == 'Student':
+        return Project.objects.filter(student=profile)
+    return review_queue(profile)
+
+
+def _scoped_reports(role, profile):
+    if role == 'Student':
+        return ProjectReport.objects.filter(project__student=profile)
+    return ProjectReport.objects.filter(project__in=review_queue(profile))
+
+
+def _scoped_archive(role, profile):
+    queryset = ArchivedProject.objects.prefetch_related('reports')
+    if role == 'Student':
+        return queryset.filter(student_register_number=profile.register_number)
+    return in_department(queryset, 'department', profile.department)
+
+
+def _list(request, queryset, spec, version):
+    """
+    Cursor-paginated list. The page window (ids + version columns) is read
+    first and hashed into the ETag; full rows are only loaded on a miss.
+    """
+    names = _selected_fields(request, spec)
+    limit = _page_size(request)
+    cursor = request.GET.get('cursor')
+    queryset = queryset.order_by('-id')
+    if cursor:
+        queryset = queryset.filter(id__lt=_decode_cursor(cursor))
+
+    window = list(queryset.values_list('id', *version)[:limit + 1])
+    has_more = len(window) > limit
+    window = window[:limit]
+    etag = _make_etag(names, cursor, limit, has_more, window)
+
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    ids = [row[0] for row in window]
+    objects = queryset.filter(id__in=ids).only(*_columns(spec, names)).order_by('-id')
+    payload = {
+        'results': [_serialize(obj, spec, names) for obj in objects],
+        'next_cursor': _encode_cursor(ids[-1]) if has_more else None,
+    }
+    return _json_response(request, payload, etag)
+
+
+def _detail_etag(queryset, pk, version):
+    """
+    ETag of one resource version. It ignores ?fields= (each field selection
+    is its own URL for caches) so it can be sent back in If-Match whatever
+    fields the client fetched.
+    """
+    row = queryset.filter(pk=pk).values_list(*version).first()
+    if row is None:
+        raise APIError('Not found.', status=404)
+    return _make_etag(pk, row)
+
+
+def _detail(request, queryset, pk, spec, version, status=200):
+    names = _selected_fields(request, spec)
+    etag = _detail_etag(queryset, pk, version)
+    if request.method in ('GET', 'HEAD'):
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+    obj = queryset.only(*_columns(spec, names)).get(pk=pk)
+    return _json_response(request, _serialize(obj, spec, names), etag, status=status)
+
+
+def _history(request, queryset):
+    """
+    Keyset-paginated review timeline, newest first. History is append-only,
+    so the ids on the page are enough for the ETag.
+    """
+    names = _selected_fields(request, REVIEW_EVENT_FIELDS)
+    limit = _page_size(request)
+    cursor = request.GET.get('cursor')
+    try:
+        events, next_cursor = reviews.timeline(queryset, cursor=cursor, limit=limit)
+    except (ValueError, UnicodeDecodeError):
+        raise APIError('Invalid cursor.')
+
+    etag = _make_etag(names, cursor, limit, next_cursor, [e.id for e in events])
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    payload = {
+        'results': [_serialize(e, REVIEW_EVENT_FIELDS, names) for e in events],
+        'next_cursor': next_cursor,
+    }
+    return _json_response(request, payload, etag)
+
+
+def api_view(view_func):
+    """Turn APIError into a JSON error response."""
+    @wraps(view_func)
+    def _wrapped(request, *args, **kwargs):
+        try:
+            return view_func(request, *args, **kwargs)
+        except APIError as e:
+            return JsonResponse({'error': str(e)}, status=e.status)
+
+    return _wrapped
+
+
+# ========== ENDPOINTS ==========
+
+@require_http_methods(['GET', 'HEAD', 'POST'])
+@api_group_required('Student', 'Faculty')
+@api_view
+def project_list(request):
+    """
+    GET: projects visible to the user (own projects for students, review
+    queue for faculty). POST (students): submit a new project.
+    """
+    role, profile = _current_profile(request)
+    if request.method == 'POST':
+        if role != 'Student':
+            raise APIError('Only students can submit projects.', status=403)
+        form = ProjectSubmissionForm(_request_data(request), request.FILES)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+        project = form.save(commit=False)
+        project.student = profile
+        project.save()
+        assign_reviewer(project)
+        index_project(project)
+        return _detail(request, _scoped_projects(role, profile), project.pk, PROJECT_FIELDS, PROJECT_VERSION, status=201)
+    return _list(request, _scoped_projects(role, profile), PROJECT_FIELDS, PROJECT_VERSION)
+
+
+@require_http_methods(['GET', 'HEAD', 'PATCH'])
+@api_group_required('Student', 'Faculty')
+@api_view
+def project_detail(request, project_id):
+    """
+    GET: one project. PATCH (faculty): review it, i.e. set `status` and/or
+    `faculty_remarks`. Send If-Match to avoid overwriting a newer review.
+    """
+    role, profile = _current_profile(request)
+    projects = _scoped_projects(role, profile)
+    if request.method == 'PATCH':
+        if role != 'Faculty':
+            raise APIError('Only faculty can review projects.', status=403)
+        # If-Match against a stale ETag answers 412 instead of overwriting
+        etag = _detail_etag(projects, project_id, PROJECT_VERSION)
+        precondition = get_conditional_response(request, etag=etag)
+        if precondition is not None:
+            return precondition
+        project = projects.get(pk=project_id)
+        data = _request_data(request)
+        form = ProjectReviewForm({
+            'status': data.get('status', project.status),
+            'faculty_remarks': data.get('faculty_remarks', project.faculty_remarks),
+        }, instance=project)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+        form.save_review(profile)
+    return _detail(request, projects, project_id, PROJECT_FIELDS, PROJECT_VERSION)
+
+
+@require_http_methods(['GET', 'HEAD'])
+@api_group_required('Student', 'Faculty')
+@api_view
+def report_list(request):
+    """Generated reports for the projects visible to the user."""
+    role, profile = _current_profile(request)
+    return _list(request, _scoped_reports(role, profile), REPORT_FIELDS, REPORT_VERSION)
+
+
+@require_http_methods(['GET', 'HEAD'])
+@api_group_required('Student', 'Faculty')
+@api_view
+def report_detail(request, report_id):
+    role, profile = _current_profile(request)
+    return _detail(request, _scoped_reports(role, profile), report_id, REPORT_FIELDS, REPORT_VERSION)
+
+
+@require_http_methods(['GET', 'HEAD', 'PATCH'])
+@api_group_required('Student', 'Faculty')
+@api_view
+def profile_detail(request):
+    """GET/PATCH the requesting user's own student or faculty profile."""
+    role, profile = _current_profile(request)
+    model, spec, editable = (
+        (StudentProfile, STUDENT_FIELDS, STUDENT_EDITABLE) if role == 'Student'
+        else (FacultyProfile, FACULTY_FIELDS, FACULTY_EDITABLE)
+    )
+    queryset = model.objects.select_related('user')
+    if request.method == 'PATCH':
+        data = _request_data(request)
+        form_class = modelform_factory(model, fields=editable)
+        form = form_class({name: data.get(name, getattr(profile, name)) for name in editable}, instance=profile)
+        if not form.is_valid():
+            return JsonResponse({'errors': form.errors.get_json_data()}, status=400)
+        user = request.user
+        if 'email' in data:
+            # the address review notifications are sent to; lives on the User
+            user.email = str(data['email']).strip()
+            try:
+                validate_email(user.email)
+            except ValidationError as e:
+                return JsonResponse({'errors': {'email': [{'message': m, 'code': 'invalid'} for m in e.messages]}}, status=400)
+        with transaction.atomic():
+            if 'email' in data:
+                user.save(update_fields=['email'])
+            # also bumps the profile's updated_at, which the ETag is built from
+            form.save()
+    return _detail(request, queryset, profile.pk, spec, PROFILE_VERSION)
+
+
+@require_http_methods(['GET', 'HEAD'])
+@api_group_required('Student', 'Faculty')
+@api_view
+def archived_project_list(request):
+    """
+    Read-only lookup of archived projects: a student's own, or those of the
+    faculty member's department. Filter with ?register_number= or ?original_id=.
+    """
+    role, profile = _current_profile(request)
+    queryset = _scoped_archive(role, profile)
+    if request.GET.get('register_number'):
+        queryset = queryset.filter(student_register_number=request.GET['register_number'])
+    if request.GET.get('original_id'):
+        try:
+            queryset = queryset.filter(original_id=int(request.GET['original_id']))
+        except ValueError:
+            raise APIError('original_id must be an integer.')
+    return _list(request, queryset, ARCHIVED_PROJECT_FIELDS, ARCHIVE_VERSION)
+
+
+@require_http_methods(['GET', 'HEAD'])
+@api_group_required('Student', 'Faculty')
+@api_view
+def archived_project_detail(request, archived_id):
+    role, profile = _current_profile(request)
+    return _detail(request, _scoped_archive(role, profile), archived_id, ARCHIVED_PROJECT_FIELDS, ARCHIVE_VERSION)
+
+
+@require_http_methods(['GET', 'HEAD'])
+@api_group_required('Student', 'Faculty')
+@api_view
+def project_history(request, project_id):
+    """
+    Review timeline of one project visible to the user. Archived projects
+    keep their history under their original id.
+    """
+    role, profile = _current_profile(request)
+    if not (
+        _scoped_projects(role, profile).filter(pk=project_id).exists()
+        or _scoped_archive(role, profile).filter(original_id=project_id).exists()
+    ):
+        raise APIError('Not found.', status=404)
+    return _history(request, ReviewEvent.objects.filter(project_id=project_id))
+
+
+@require_http_methods(['GET', 'HEAD'])
+@api_group_required('Faculty')
+@api_view
+def faculty_history(request, faculty_id):
+    """Reviews made by a faculty member of the requesting user's department."""
+    role, profile = _current_profile(request)
+    colleagues = in_department(FacultyProfile.objects.filter(pk=faculty_id), 'department', profile.department)
+    if faculty_id != profile.id and not colleagues.exists():
+        raise APIError('Not found.', status=404)
+    return _history(request, ReviewEvent.objects.filter(faculty_id=faculty_id))
+
+
+@require_http_methods(['GET', 'HEAD', 'POST'])
+@api_group_required('Admin')
+@api_view
+def change_feed(request):
+    """
+    Change-data-capture feed for downstream systems (Admin group).
+
+    GET ?after=<offset> or ?consumer=<name> returns the next events in offset
+    order; `next_after` is the offset to continue from. POST
+    {"consumer": ..., "position": ...} commits a consumer's offset.
+    """
+    if request.method == 'POST':
+        data = _request_data(request)
+        try:
+            consumer = str(data['consumer'])
+            position = int(data['position'])
+        except (KeyError, TypeError, ValueError):
+            raise APIError('consumer and integer position are required.')
+        return JsonResponse({'consumer': consumer, 'position': changefeed.commit_position(consumer, position)})
+
+    try:
+        limit = int(request.GET.get('limit', settings.CHANGE_FEED_BATCH_SIZE))
+        limit = max(1, min(limit, settings.CHANGE_FEED_MAX_BATCH_SIZE))
+        if 'after' in request.GET:
+            after = int(request.GET['after'])
+        else:
+            after = changefeed.get_position(request.GET.get('consumer', ''))
+    except ValueError:
+        raise APIError('after and limit must be integers.')
+
+    events = changefeed.read_events(after=after, limit=limit)
+    return JsonResponse({
+        'events': [changefeed.serialize_event(e) for e in events],
+        'next_after': events[-1].id if events else after,
+        'has_more': len(events) == limit,
+    })
@@ -32,3 +32,6 @@ class CoreConfig(AppConfig):
 
         post_migrate.connect(create_user_groups, sender=self)
         post_save.connect(assign_superuser_to_admin, sender=User)
+
+        # Model signal handlers (media cleanup, ...) register on import
+        from . import signals  # noqa: F401
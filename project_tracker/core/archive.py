@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models import Q
+
+from .models import ArchivedProject, ArchivedProjectReport, Project
+
+
+def archivable_projects(before=None, graduated=False):
+    """
+    Projects eligible for archival: submitted before `before`, and/or
+    belonging to students flagged as graduated.
+    """
+    condition = Q()
+    if before is not None:
+        condition |= Q(submitted_at__lt=before)
+    if graduated:
+        condition |= Q(student__graduated=True)
+    if not condition:
+        raise ValueError('Give a cutoff date and/or graduated=True.')
+    return Project.objects.filter(condition)
+
+
+def _archive_copy(project):
+    return ArchivedProject(
+        original_id=project.id,
+        student_register_number=project.student.register_number,
+        student_username=project.student.user.username,
+        department=project.student.department,
+        title=project.title,
+        domain=project.domain,
+        description=project.description,
+        status=project.status,
+        faculty_reviewer_username=project.faculty_reviewer.user.username if project.faculty_reviewer else '',
+        faculty_remarks=project.faculty_remarks,
+        attachment=project.attachment.name or '',
+        submitted_at=project.submitted_at,
+        reviewed_at=project.reviewed_at,
+    )
+
+
+def _archive_report_copy(report, archived_project):
+    return ArchivedProjectReport(
+        archived_project=archived_project,
+        original_id=report.id,
+        generated_by_username=report.generated_by.user.username if report.generated_by else '',
+        generated_at=report.generated_at,
+        pdf_file=report.pdf_file.name or '',
+        notes=report.notes,
+    )
+
+
+def is_archived(project_id):
+    """True once `project_id` has been copied into the archive tables."""
+    return ArchivedProject.objects.filter(original_id=project_id).exists()
+
+
+def archive_batch(ids):
+    """
+    Move the given projects and their reports into the archive tables in one
+    transaction. Stored files are left in place: the archive rows keep
+    referencing them, so media cleanup treats them as still in use.
+    """
+    with transaction.atomic():
+        projects = list(
+            Project.objects.filter(id__in=ids)
+            .select_related('student__user', 'faculty_reviewer__user')
+            .prefetch_related('reports__generated_by__user')
+        )
+        archived = ArchivedProject.objects.bulk_create([_archive_copy(p) for p in projects])
+        reports = [
+            _archive_report_copy(report, copy)
+            for project, copy in zip(projects, archived)
+            for report in project.reports.all()
+        ]
+        ArchivedProjectReport.objects.bulk_create(reports)
+        Project.objects.filter(id__in=[p.id for p in projects]).delete()
+    return len(projects), len(reports)
+
+
+def archive_projects(queryset, batch_size=200):
+    """
+    Archive every project in `queryset`, `batch_size` at a time so each
+    transaction (and the lock it holds) stays short. Yields
+    (projects, reports) counts per batch.
+    """
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield archive_batch(ids)
@@ -0,0 +1,156 @@
+import heapq
+import math
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Lower, Trim
+from django.utils import timezone
+
+from .models import FacultyProfile, Project
+
+
+def _department_key(department):
+    # Departments are free text on both profiles ("CSE", "cse "), so compare loosely
+    return (department or '').strip().lower()
+
+
+def in_department(queryset, field, department):
+    """Filter `queryset` to rows whose `field` matches `department` under _department_key."""
+    return queryset.alias(department_key=Lower(Trim(field))).filter(department_key=_department_key(department))
+
+
+def faculty_with_open_load(queryset=None):
+    """
+    Annotate faculty members with `open_load`, the number of pending projects
+    currently assigned to them.
+    """
+    queryset = queryset if queryset is not None else FacultyProfile.objects.all()
+    return queryset.annotate(
+        open_load=Count(
+            'reviewed_projects',
+            filter=Q(reviewed_projects__status=Project.STATUS_PENDING),
+        )
+    )
+
+
+def review_queue(faculty_profile):
+    """
+    Projects a faculty member should see: the ones assigned to them plus any
+    unassigned submissions from their department.
+    """
+    return Project.objects.alias(department_key=Lower(Trim('student__department'))).filter(
+        Q(faculty_reviewer=faculty_profile)
+        | Q(faculty_reviewer__isnull=True, department_key=_department_key(faculty_profile.department))
+    )
+
+
+def assign_reviewer(project):
+    """
+    Assign a freshly submitted project to the least loaded faculty member of
+    the student's department who is still under their `max_open_reviews` cap.
+
+    Returns the chosen FacultyProfile, or None if nobody has spare capacity
+    (the project then stays in the shared department queue until the next
+    rebalance).
+    """
+    if project.status != Project.STATUS_PENDING or project.faculty_reviewer_id:
+        return project.faculty_reviewer
+
+    with transaction.atomic():
+        reviewer = (
+            faculty_with_open_load(
+                in_department(FacultyProfile.objects.all(), 'department', project.student.department)
+            )
+            .filter(open_load__lt=F('max_open_reviews'))
+            .order_by('open_load', 'id')
+            .first()
+        )
+        if reviewer is None:
+            return None
+        project.faculty_reviewer = reviewer
+        project.save(update_fields=['faculty_reviewer', 'updated_at'])
+    return reviewer
+
+
+def rebalance(department=None, dry_run=False):
+    """
+    Redistribute all pending projects across faculty of the same department.
+
+    Each faculty member keeps their oldest assignments up to their fair share
+    (and never above their cap); everything else, including unassigned and
+    cross-department assignments, is handed out least-loaded-first. Returns a
+    list of per-department summaries.
+    """
+    pending = Project.objects.filter(status=Project.STATUS_PENDING).select_related('student').order_by('submitted_at', 'id')
+    faculty = FacultyProfile.objects.all()
+    if department:
+        pending = in_department(pending, 'student__department', department)
+        faculty = in_department(faculty, 'department', department)
+
+    projects_by_dept = defaultdict(list)
+    for project in pending:
+        projects_by_dept[_department_key(project.student.department)].append(project)
+    faculty_by_dept = defaultdict(list)
+    for member in faculty:
+        faculty_by_dept[_department_key(member.department)].append(member)
+
+    now = timezone.now()
+    changed = []
+    summaries = []
+    for dept, projects in sorted(projects_by_dept.items()):
+        staff = faculty_by_dept.get(dept, [])
+        summary = {
+            'department': dept,
+            'faculty': len(staff),
+            'pending': len(projects),
+            'reassigned': 0,
+            'unassigned': 0,
+        }
+        for project in projects:
+            project._original_reviewer_id = project.faculty_reviewer_id
+        if staff:
+            loads = _distribute(projects, staff)
+            summary['max_load'] = max(loads.values())
+            summary['min_load'] = min(loads.values())
+        for project in projects:
+            if project.faculty_reviewer_id != project._original_reviewer_id:
+                project.updated_at = now
+                changed.append(project)
+                summary['reassigned'] += 1
+            if project.faculty_reviewer_id is None:
+                summary['unassigned'] += 1
+        summaries.append(summary)
+
+    if changed and not dry_run:
+        with transaction.atomic():
+            Project.objects.bulk_update(changed, ['faculty_reviewer', 'updated_at'], batch_size=500)
+    return summaries
+
+
+def _distribute(projects, staff):
+    """Assign `projects` in place across `staff`; returns final load per faculty id."""
+    caps = {member.id: member.max_open_reviews for member in staff}
+    fair_share = math.ceil(len(projects) / len(staff))
+    loads = {member.id: 0 for member in staff}
+
+    released = []
+    for project in projects:
+        reviewer_id = project.faculty_reviewer_id
+        if reviewer_id in loads and loads[reviewer_id] < min(caps[reviewer_id], fair_share):
+            loads[reviewer_id] += 1
+        else:
+            released.append(project)
+
+    heap = [(loads[member.id], member.id) for member in staff if loads[member.id] < caps[member.id]]
+    heapq.heapify(heap)
+    for project in released:
+        if not heap:
+            project.faculty_reviewer_id = None
+            continue
+        load, reviewer_id = heapq.heappop(heap)
+        project.faculty_reviewer_id = reviewer_id
+        loads[reviewer_id] = load + 1
+        if load + 1 < caps[reviewer_id]:
+            heapq.heappush(heap, (load + 1, reviewer_id))
+    return loads
@@ -0,0 +1,72 @@
+"""
+Change-data-capture feed of project and review events.
+
+Signal handlers append ChangeEvent rows inside the writing transaction.
+Consumers read events with id greater than their last offset, in id order,
+so detecting changes costs O(new events) instead of re-exporting tables.
+Offsets are only gap-free while writers are serialised, which SQLite
+guarantees.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ChangeEvent, ChangeFeedCursor
+
+PROJECT_CREATED = 'project.created'
+PROJECT_STATUS_CHANGED = 'project.status_changed'
+PROJECT_REMARKS_CHANGED = 'project.remarks_changed'
+PROJECT_DELETED = 'project.deleted'
+# the project moved to the archive tables; it still exists for reporting
+PROJECT_ARCHIVED = 'project.archived'
+REPORT_CREATED = 'report.created'
+
+
+def record_event(event_type, project_id, **payload):
+    return ChangeEvent.objects.create(event_type=event_type, project_id=project_id, payload=payload)
+
+
+def serialize_event(event):
+    return {
+        'id': event.id,
+        'type': event.event_type,
+        'project': event.project_id,
+        'payload': event.payload,
+        'created_at': event.created_at.isoformat(),
+    }
+
+
+def read_events(after=0, limit=None):
+    """Up to `limit` events with id > `after`, oldest first."""
+    limit = limit or settings.CHANGE_FEED_BATCH_SIZE
+    return list(ChangeEvent.objects.filter(id__gt=after).order_by('id')[:limit])
+
+
+def get_position(consumer):
+    return ChangeFeedCursor.objects.filter(consumer=consumer).values_list('position', flat=True).first() or 0
+
+
+def commit_position(consumer, position):
+    """Store `consumer`'s offset; it never moves backwards."""
+    cursor, _ = ChangeFeedCursor.objects.get_or_create(consumer=consumer)
+    if position > cursor.position:
+        cursor.position = position
+        cursor.save(update_fields=['position', 'updated_at'])
+    return cursor.position
+
+
+def compact(older_than_days=None, batch_size=1000):
+    """
+    Delete events older than the retention period, batch by batch.
+    Consumers further behind than that lose those events. Returns the
+    number of events deleted.
+    """
+    days = settings.CHANGE_FEED_RETENTION_DAYS if older_than_days is None else older_than_days
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted = 0
+    while True:
+        ids = list(ChangeEvent.objects.filter(created_at__lt=cutoff).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += ChangeEvent.objects.filter(id__in=ids).delete()[0]
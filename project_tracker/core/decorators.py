@@ -1,6 +1,11 @@
+import hashlib
 from functools import wraps
+from django.conf import settings
 from django.shortcuts import redirect
 from django.contrib import messages
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 
 
 def group_required(group_name, login_url='login'):
@@ -25,3 +30,76 @@ def group_required(group_name, login_url='login'):
         return _wrapped
 
     return decorator
+
+
+def api_group_required(*group_names):
+    """JSON counterpart of group_required: answers 401/403 instead of redirecting.
+
+    The user must belong to at least one of `group_names`.
+
+    Usage:
+        @api_group_required('Student', 'Faculty')
+        def api_view(...):
+            ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            user = request.user
+            if not user.is_authenticated:
+                return JsonResponse({'error': 'Authentication required.'}, status=401)
+            if not user.groups.filter(name__in=group_names).exists():
+                return JsonResponse({'error': 'You do not have permission to access this resource.'}, status=403)
+            return view_func(request, *args, **kwargs)
+
+        return _wrapped
+
+    return decorator
+
+
+def conditional_page(state_func):
+    """Answer repeat GETs of a page with 304 Not Modified before the view runs.
+
+    `state_func(request)` must cheaply summarise everything the page shows
+    (e.g. the max `updated_at` and row count of the objects listed) and
+    return (last_modified, version), or None to skip the check. The ETag
+    also covers the user and their CSRF cookie, since both are rendered into
+    the page. Requests with pending flash messages are always rendered.
+
+    Usage:
+        @group_required('Student')
+        @conditional_page(student_page_state)
+        def view(...):
+            ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+                return view_func(request, *args, **kwargs)
+            state = state_func(request)
+            if state is None:
+                return view_func(request, *args, **kwargs)
+
+            last_modified, version = state
+            user = request.user
+            etag = quote_etag(hashlib.sha1(repr((
+                user.pk, user.username, user.first_name, user.last_name,
+                request.COOKIES.get(settings.CSRF_COOKIE_NAME), version, last_modified,
+            )).encode()).hexdigest())
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+                if response.status_code == 200:
+                    response.headers.setdefault('ETag', etag)
+                    if timestamp is not None:
+                        response.headers.setdefault('Last-Modified', http_date(timestamp))
+                    # private pages: browsers may keep them but must revalidate
+                    patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return _wrapped
+
+    return decorator
@@ -1,6 +1,10 @@
 from django import forms
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
 from .models import Project
+from .notifications import notify_on_review
+from .reviews import record_review
 
 
 class ProjectSubmissionForm(forms.ModelForm):
@@ -35,3 +39,28 @@ class ProjectReviewForm(forms.ModelForm):
             'status': forms.Select(attrs={'class': 'form-control'}),
             'faculty_remarks': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Add your remarks...'}),
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # remember the status before the review so a change can be detected
+        self.previous_status = self.instance.status
+
+    def save_review(self, faculty_profile):
+        """
+        Save the review made by `faculty_profile`.
+        The review-history row and the student's notification are written in
+        the same transaction; the notification is delivered later by
+        `manage.py drain_outbox`.
+        """
+        project = self.save(commit=False)
+        project.faculty_reviewer = faculty_profile
+        now = timezone.now()
+        if project.status != Project.STATUS_PENDING:
+            project.reviewed_at = now
+        with transaction.atomic():
+            project.save()
+            # resubmitting the same decision adds nothing to the history
+            if self.has_changed():
+                record_review(project, reviewed_at=now)
+            notify_on_review(project, self.previous_status)
+        return project
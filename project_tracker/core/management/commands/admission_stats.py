@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import admission
+
+
+class Command(BaseCommand):
+    help = "Show admission control counters and current in-flight requests per endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them.')
+
+    def handle(self, *args, **options):
+        if not settings.ADMISSION_CONTROL:
+            self.stdout.write('No endpoints under admission control.')
+            return
+        for endpoint in settings.ADMISSION_CONTROL:
+            s = admission.stats(endpoint)
+            self.stdout.write(
+                f"{endpoint}: {s['in_flight']}/{s['concurrency']} in flight, "
+                f"{s['admitted']} admitted, {s['rejected_busy']} rejected busy (503), "
+                f"{s['rejected_rate']} rejected rate-limited (429)"
+            )
+            if options['reset']:
+                admission.reset_stats(endpoint)
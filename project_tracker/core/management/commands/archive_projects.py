@@ -0,0 +1,52 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.archive import archivable_projects, archive_projects
+
+
+class Command(BaseCommand):
+    help = (
+        "Move old projects (and their reports) out of the live tables into the "
+        "archive, in batches. Archived records stay readable via /api/archive/."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', type=datetime.date.fromisoformat,
+                            help='Archive projects submitted before this date (YYYY-MM-DD).')
+        parser.add_argument('--academic-year', type=int,
+                            help='Archive projects from academic years ending before this one, '
+                                 'i.e. submitted before 1 July of the given year.')
+        parser.add_argument('--graduated', action='store_true',
+                            help="Archive projects of students marked as graduated.")
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help='Projects moved per transaction (default: 200).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count what would be archived.')
+
+    def handle(self, *args, **options):
+        cutoff_date = options['before']
+        if options['academic_year']:
+            cutoff_date = datetime.date(options['academic_year'], 7, 1)
+        cutoff = None
+        if cutoff_date:
+            cutoff = timezone.make_aware(datetime.datetime.combine(cutoff_date, datetime.time.min))
+
+        try:
+            queryset = archivable_projects(before=cutoff, graduated=options['graduated'])
+        except ValueError:
+            raise CommandError('Give --before, --academic-year and/or --graduated.')
+
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} projects would be archived.")
+            return
+
+        total_projects = total_reports = 0
+        for projects, reports in archive_projects(queryset, batch_size=max(1, options['batch_size'])):
+            total_projects += projects
+            total_reports += reports
+            self.stdout.write(f"archived {total_projects} projects so far")
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {total_projects} projects and {total_reports} reports."
+        ))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from core.assignment import rebalance
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebalance pending projects across faculty of the matching department, "
+        "respecting each faculty member's max_open_reviews cap."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--department', help='Only rebalance this department.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Show the resulting distribution without saving it.')
+
+    def handle(self, *args, **options):
+        summaries = rebalance(department=options['department'], dry_run=options['dry_run'])
+        if not summaries:
+            self.stdout.write('No pending projects.')
+            return
+
+        for s in summaries:
+            line = (
+                f"{s['department'] or '(none)'}: {s['pending']} pending, {s['faculty']} faculty, "
+                f"{s['reassigned']} reassigned, {s['unassigned']} unassigned"
+            )
+            if s['faculty']:
+                line += f", load {s['min_load']}-{s['max_load']}"
+            self.stdout.write(line)
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: no changes saved.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Rebalance complete.'))
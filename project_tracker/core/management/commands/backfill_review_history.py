@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import reviews
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild review history for past reviews from the status and remarks "
+        "recorded in generated project reports. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Reports read per batch (default: 500).')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total = reviews.backfill_from_reports(batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(
+            f"Backfilled {total} review events in {time.monotonic() - started:.2f}s."
+        ))
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.storage import (
+    MEDIA_PREFIXES, file_size, is_older_than, iter_stored_files, referenced_names,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete uploaded files that no Project or ProjectReport refers to any "
+        "more. Storage is walked incrementally and checked against the "
+        "database one batch at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report what would be deleted.')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Number of files checked against the DB per query (default: 500).')
+        parser.add_argument('--grace-minutes', type=int, default=60,
+                            help='Skip files modified more recently than this, so uploads '
+                                 'whose rows are not committed yet survive (default: 60).')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        batch_size = max(1, options['batch_size'])
+        cutoff = timezone.now() - timedelta(minutes=options['grace_minutes'])
+
+        stats = {'scanned': 0, 'orphans': 0, 'bytes': 0}
+        for prefix in MEDIA_PREFIXES:
+            batch = []
+            for name in iter_stored_files(default_storage, prefix):
+                batch.append(name)
+                if len(batch) >= batch_size:
+                    self._process_batch(batch, cutoff, dry_run, stats)
+                    batch = []
+            if batch:
+                self._process_batch(batch, cutoff, dry_run, stats)
+
+        verb = 'Would reclaim' if dry_run else 'Reclaimed'
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {stats['scanned']} files, {stats['orphans']} orphaned. "
+            f"{verb} {stats['bytes']} bytes."
+        ))
+
+    def _process_batch(self, batch, cutoff, dry_run, stats):
+        stats['scanned'] += len(batch)
+        in_use = referenced_names(batch)
+        for name in batch:
+            if name in in_use or not is_older_than(default_storage, name, cutoff):
+                continue
+            size = file_size(default_storage, name)
+            stats['orphans'] += 1
+            stats['bytes'] += size
+            if dry_run:
+                self.stdout.write(f"orphan: {name} ({size} bytes)")
+            else:
+                default_storage.delete(name)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core import changefeed
+
+
+class Command(BaseCommand):
+    help = "Delete change feed events older than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int,
+                            help='Retention in days (default: CHANGE_FEED_RETENTION_DAYS).')
+
+    def handle(self, *args, **options):
+        deleted = changefeed.compact(older_than_days=options['older_than_days'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} events."))
@@ -0,0 +1,38 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core import changefeed
+
+
+class Command(BaseCommand):
+    help = (
+        "Print change feed events after a consumer's stored offset as JSON "
+        "lines, committing the offset after each batch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('consumer', help='Consumer name whose offset is resumed and committed.')
+        parser.add_argument('--batch-size', type=int, help='Events per batch (default: CHANGE_FEED_BATCH_SIZE).')
+        parser.add_argument('--max-batches', type=int, default=0,
+                            help='Stop after this many batches (default: until caught up).')
+        parser.add_argument('--no-commit', action='store_true',
+                            help='Read without moving the stored offset.')
+
+    def handle(self, *args, **options):
+        consumer = options['consumer']
+        position = changefeed.get_position(consumer)
+        batches = 0
+        while True:
+            events = changefeed.read_events(after=position, limit=options['batch_size'])
+            if not events:
+                break
+            for event in events:
+                self.stdout.write(json.dumps(changefeed.serialize_event(event)))
+            position = events[-1].id
+            if not options['no_commit']:
+                changefeed.commit_position(consumer, position)
+            batches += 1
+            if options['max_batches'] and batches >= options['max_batches']:
+                break
+        self.stderr.write(f"{consumer} at offset {position}")
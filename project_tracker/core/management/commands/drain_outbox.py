@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.notifications import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notification emails, batched into one digest per recipient."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            help='Messages claimed per batch (default: OUTBOX_BATCH_SIZE).')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, polling for new messages.')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds to sleep between polls when idle with --loop (default: 5).')
+
+    def handle(self, *args, **options):
+        while True:
+            stats = drain_outbox(batch_size=options['batch_size'])
+            if any(stats.values()):
+                self.stdout.write(
+                    f"sent {stats['sent']} in {stats['digests']} digests, "
+                    f"{stats['retried']} retrying, {stats['failed']} failed, {stats['skipped']} skipped"
+                )
+            if not options['loop']:
+                break
+            # keep going straight away while there is a backlog
+            if not any(stats.values()):
+                time.sleep(options['interval'])
@@ -0,0 +1,109 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Runs in a fresh interpreter: boots the WSGI application exactly like a
+# worker would, serves one request and prints the timings as JSON.
+CHILD_SCRIPT = """
+import io, json, sys, time
+t0 = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+t1 = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+environ = {'PATH_INFO': %(path)r, 'REQUEST_METHOD': 'GET', 'wsgi.errors': io.StringIO()}
+setup_testing_defaults(environ)
+status = []
+body = b''.join(application(environ, lambda s, h, e=None: status.append(s)))
+t2 = time.perf_counter()
+print(json.dumps({
+    'setup_ms': (t1 - t0) * 1000,
+    'first_request_ms': (t2 - t1) * 1000,
+    'status': status[0] if status else '',
+    'modules': sorted(sys.modules),
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """Parse `python -X importtime` output into (module, self_us, cumulative_us) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+            rows.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker cold start: per-module import cost and time to first "
+        "request, each in a fresh interpreter. Fails if the median cold start "
+        "exceeds the budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3,
+                            help='Number of cold starts to measure (default: 3).')
+        parser.add_argument('--top', type=int, default=15,
+                            help='Number of most expensive imports to list (default: 15).')
+        parser.add_argument('--path', default='/login/',
+                            help='URL requested as the first request (default: /login/).')
+        parser.add_argument('--budget-ms', type=float, default=settings.STARTUP_BUDGET_MS,
+                            help='Fail when median cold start exceeds this (default: STARTUP_BUDGET_MS).')
+        parser.add_argument('--no-budget', action='store_true',
+                            help='Only check that lazy modules stay unimported; report timings without failing on them.')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'project_tracker.settings'))
+        script = CHILD_SCRIPT % {'path': options['path']}
+
+        runs = []
+        imports = []
+        for _ in range(max(1, options['runs'])):
+            started = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', script],
+                cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            )
+            wall_ms = (time.perf_counter() - started) * 1000
+            if proc.returncode != 0:
+                raise CommandError(f"Worker start-up failed:\n{proc.stderr[-2000:]}")
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            result['wall_ms'] = wall_ms
+            runs.append(result)
+            imports = parse_importtime(proc.stderr)
+
+        self.stdout.write("Slowest imports (cumulative, last run):")
+        for module, self_us, cumulative_us in sorted(imports, key=lambda r: r[2], reverse=True)[:options['top']]:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {module}")
+
+        loaded = runs[-1]['modules']
+        eager = [name for name in settings.STARTUP_LAZY_MODULES if name in loaded]
+
+        median = {key: statistics.median(r[key] for r in runs) for key in ('wall_ms', 'setup_ms', 'first_request_ms')}
+        self.stdout.write(
+            f"Cold start over {len(runs)} run(s), median: process {median['wall_ms']:.0f} ms, "
+            f"app setup {median['setup_ms']:.0f} ms, first request {median['first_request_ms']:.0f} ms "
+            f"({runs[-1]['status']})"
+        )
+
+        if eager:
+            raise CommandError(f"Imported at start-up but meant to be lazy: {', '.join(eager)}")
+        if options['no_budget']:
+            self.stdout.write(self.style.SUCCESS('Lazy modules stay unimported (budget not checked).'))
+            return
+        if median['wall_ms'] > options['budget_ms']:
+            raise CommandError(f"Cold start budget exceeded (budget {options['budget_ms']:.0f} ms).")
+        self.stdout.write(self.style.SUCCESS(f"Within budget of {options['budget_ms']:.0f} ms."))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import similarity
+
+
+class Command(BaseCommand):
+    help = "Recompute MinHash signatures and LSH buckets for all projects."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Projects processed per batch (default: 500).')
+
+    def handle(self, *args, **options):
+        if similarity.batch_signature_function() is similarity.compute_signatures:
+            self.stdout.write(self.style.WARNING('NumPy not installed; using the pure Python signatures.'))
+        started = time.monotonic()
+        total = similarity.rebuild_index(batch_size=max(1, options['batch_size']))
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {total} projects in {time.monotonic() - started:.2f}s."
+        ))
@@ -0,0 +1,44 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database into the read replica using SQLite's "
+        "online backup API. The primary stays readable and writable meanwhile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target',
+                            help='Replica file to write (default: the NAME of DATABASE_READ_ALIAS).')
+        parser.add_argument('--pages', type=int, default=1024,
+                            help='Pages copied per backup step (default: 1024).')
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('refresh_replica only supports SQLite databases.')
+
+        target = options['target']
+        alias = settings.DATABASE_READ_ALIAS
+        if not target:
+            if not alias:
+                raise CommandError('No read replica configured; pass --target or set DJANGO_READ_REPLICA.')
+            target = settings.DATABASES[alias]['NAME']
+            # Drop this process's handle on the old replica contents
+            connections[alias].close()
+
+        primary.ensure_connection()
+        started = time.monotonic()
+        replica = sqlite3.connect(str(target))
+        try:
+            primary.connection.backup(replica, pages=max(1, options['pages']))
+        finally:
+            replica.close()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f"Replica {target} refreshed in {elapsed:.2f}s."))
@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import decorator_from_middleware
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # optional dependency: `pip install brotli` enables br
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress HTML responses of at least COMPRESSION_MIN_SIZE bytes, using
+    brotli when both the client and the server support it, gzip otherwise.
+    Streaming responses (file downloads) are passed through untouched.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        ae = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if brotli is None or not re_accepts_brotli.search(ae):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed_content = brotli.compress(response.content, quality=settings.BROTLI_QUALITY)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+        # Same ETag weakening as GZipMiddleware
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+# Per-view form, used on the HTML pages; the JSON API keeps its strong ETags
+compress_page = decorator_from_middleware(CompressionMiddleware)
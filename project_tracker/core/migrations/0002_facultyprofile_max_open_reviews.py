@@ -0,0 +1,18 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facultyprofile',
+            name='max_open_reviews',
+            field=models.PositiveIntegerField(default=10, help_text='Maximum number of pending projects assigned to this faculty member at once'),
+        ),
+    ]
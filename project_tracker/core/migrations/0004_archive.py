@@ -0,0 +1,58 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_notificationoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('student_register_number', models.CharField(db_index=True, max_length=20)),
+                ('student_username', models.CharField(max_length=150)),
+                ('department', models.CharField(max_length=100)),
+                ('title', models.CharField(max_length=255)),
+                ('domain', models.CharField(max_length=100)),
+                ('description', models.TextField()),
+                ('status', models.CharField(choices=[('P', 'Pending'), ('A', 'Approved'), ('R', 'Rejected')], max_length=1)),
+                ('faculty_reviewer_username', models.CharField(blank=True, max_length=150)),
+                ('faculty_remarks', models.TextField(blank=True)),
+                ('attachment', models.FileField(blank=True, upload_to='project_attachments/')),
+                ('submitted_at', models.DateTimeField()),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Archived Projects',
+                'ordering': ['-submitted_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='graduated',
+            field=models.BooleanField(default=False, help_text="Graduated students' projects are moved to the archive"),
+        ),
+        migrations.CreateModel(
+            name='ArchivedProjectReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('generated_by_username', models.CharField(blank=True, max_length=150)),
+                ('generated_at', models.DateTimeField()),
+                ('pdf_file', models.FileField(blank=True, upload_to='project_reports/')),
+                ('notes', models.TextField(blank=True)),
+                ('archived_project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reports', to='core.archivedproject')),
+            ],
+            options={
+                'ordering': ['-generated_at'],
+            },
+        ),
+    ]
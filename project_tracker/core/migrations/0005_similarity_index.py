@@ -0,0 +1,36 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSignature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='signature', to='core.project')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LSHBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_buckets', to='core.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='lsh_bucket_idx')],
+                'unique_together': {('project', 'band')},
+            },
+        ),
+    ]
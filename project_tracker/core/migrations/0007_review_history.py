@@ -0,0 +1,30 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('P', 'Pending'), ('A', 'Approved'), ('R', 'Rejected')], max_length=1)),
+                ('remarks', models.TextField(blank=True)),
+                ('reviewed_at', models.DateTimeField()),
+                ('source', models.CharField(choices=[('R', 'Review'), ('B', 'Backfilled from report')], default='R', max_length=1)),
+                ('faculty', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='review_events', to='core.facultyprofile')),
+                ('project', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='review_events', to='core.project')),
+            ],
+            options={
+                'ordering': ['-reviewed_at', '-id'],
+                'indexes': [models.Index(fields=['project', '-reviewed_at', '-id'], name='review_project_time_idx'), models.Index(fields=['faculty', '-reviewed_at', '-id'], name='review_faculty_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_review_history'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='lshbucket',
+            name='lsh_bucket_idx',
+        ),
+        migrations.AlterField(
+            model_name='lshbucket',
+            name='project',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='lsh_buckets', to='core.project'),
+        ),
+        migrations.AlterField(
+            model_name='projectsignature',
+            name='project',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='signature', to='core.project'),
+        ),
+        migrations.AddIndex(
+            model_name='lshbucket',
+            index=models.Index(fields=['bucket', 'band'], name='lsh_bucket_idx'),
+        ),
+    ]
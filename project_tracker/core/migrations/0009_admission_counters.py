@@ -0,0 +1,25 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_similarity_outlives_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(max_length=100)),
+                ('metric', models.CharField(max_length=30)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('endpoint', 'metric')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.8 on 2026-10-19 15:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_admission_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedproject',
+            name='attachment',
+            field=models.FileField(blank=True, db_index=True, upload_to='project_attachments/'),
+        ),
+        migrations.AlterField(
+            model_name='archivedprojectreport',
+            name='pdf_file',
+            field=models.FileField(blank=True, db_index=True, upload_to='project_reports/'),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='attachment',
+            field=models.FileField(blank=True, db_index=True, null=True, upload_to='project_attachments/'),
+        ),
+        migrations.AlterField(
+            model_name='projectreport',
+            name='pdf_file',
+            field=models.FileField(blank=True, db_index=True, null=True, upload_to='project_reports/'),
+        ),
+    ]
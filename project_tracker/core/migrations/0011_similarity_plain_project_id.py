@@ -0,0 +1,48 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Replace the unconstrained `project` foreign keys of ProjectSignature and
+    LSHBucket with plain `project_id` integers. The column, its type and its
+    indexes stay exactly the same, so only the migration state changes.
+    """
+
+    dependencies = [
+        ('core', '0010_index_file_references'),
+    ]
+
+    state_operations = [
+        migrations.AlterUniqueTogether(
+            name='lshbucket',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='lshbucket',
+            name='project',
+        ),
+        migrations.RemoveField(
+            model_name='projectsignature',
+            name='project',
+        ),
+        migrations.AddField(
+            model_name='lshbucket',
+            name='project_id',
+            field=models.BigIntegerField(db_index=True),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='projectsignature',
+            name='project_id',
+            field=models.BigIntegerField(unique=True),
+            preserve_default=False,
+        ),
+        migrations.AlterUniqueTogether(
+            name='lshbucket',
+            unique_together={('project_id', 'band')},
+        ),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(state_operations=state_operations),
+    ]
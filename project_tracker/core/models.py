@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 # StudentProfile Model
 class StudentProfile(models.Model):
@@ -14,6 +15,7 @@ class StudentProfile(models.Model):
         choices=[(1, '1st Year'), (2, '2nd Year'), (3, '3rd Year'), (4, '4th Year')],
         help_text="Academic year"
     )
+    graduated = models.BooleanField(default=False, help_text="Graduated students' projects are moved to the archive")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -44,6 +46,10 @@ class FacultyProfile(models.Model):
         ],
         help_text="Faculty designation/position"
     )
+    max_open_reviews = models.PositiveIntegerField(
+        default=10,
+        help_text="Maximum number of pending projects assigned to this faculty member at once"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -73,7 +79,7 @@ class Project(models.Model):
     status = models.CharField(max_length=1, choices=STATUS_CHOICES, default=STATUS_PENDING)
     faculty_reviewer = models.ForeignKey(FacultyProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='reviewed_projects')
     faculty_remarks = models.TextField(blank=True)
-    attachment = models.FileField(upload_to='project_attachments/', null=True, blank=True)
+    attachment = models.FileField(upload_to='project_attachments/', null=True, blank=True, db_index=True)
     submitted_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -90,7 +96,7 @@ class ProjectReport(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='reports')
     generated_by = models.ForeignKey(FacultyProfile, on_delete=models.SET_NULL, null=True, blank=True)
     generated_at = models.DateTimeField(auto_now_add=True)
-    pdf_file = models.FileField(upload_to='project_reports/', null=True, blank=True)
+    pdf_file = models.FileField(upload_to='project_reports/', null=True, blank=True, db_index=True)
     notes = models.TextField(blank=True)
 
     class Meta:
@@ -99,3 +105,217 @@ class ProjectReport(models.Model):
     def __str__(self):
         by = self.generated_by.user.username if self.generated_by else 'N/A'
         return f"Report for {self.project.title} by {by}"
+
+
+# NotificationOutbox Model
+class NotificationOutbox(models.Model):
+    """
+    Email notifications waiting to be delivered.
+    Rows are written in the same transaction as the change they announce and
+    delivered later by `manage.py drain_outbox`, batched per recipient.
+    """
+    STATUS_PENDING = 'P'
+    STATUS_SENT = 'S'
+    STATUS_FAILED = 'F'
+    STATUS_SKIPPED = 'K'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+        (STATUS_SKIPPED, 'Skipped (no email address)'),
+    ]
+
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='outbox_messages')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=1, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "Notification Outbox"
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient.username} ({self.get_status_display()})"
+
+
+# ArchivedProject Model
+class ArchivedProject(models.Model):
+    """
+    Read-only copy of a Project moved out of the live tables by
+    `manage.py archive_projects`. Student and reviewer are stored by value so
+    the archive survives deletion of the original profiles.
+    """
+    original_id = models.BigIntegerField(unique=True)
+    student_register_number = models.CharField(max_length=20, db_index=True)
+    student_username = models.CharField(max_length=150)
+    department = models.CharField(max_length=100)
+    title = models.CharField(max_length=255)
+    domain = models.CharField(max_length=100)
+    description = models.TextField()
+    status = models.CharField(max_length=1, choices=Project.STATUS_CHOICES)
+    faculty_reviewer_username = models.CharField(max_length=150, blank=True)
+    faculty_remarks = models.TextField(blank=True)
+    attachment = models.FileField(upload_to='project_attachments/', blank=True, db_index=True)
+    submitted_at = models.DateTimeField()
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = "Archived Projects"
+        ordering = ['-submitted_at']
+
+    def __str__(self):
+        return f"{self.title} ({self.student_register_number}) [archived]"
+
+
+# ArchivedProjectReport Model
+class ArchivedProjectReport(models.Model):
+    archived_project = models.ForeignKey(ArchivedProject, on_delete=models.CASCADE, related_name='reports')
+    original_id = models.BigIntegerField(unique=True)
+    generated_by_username = models.CharField(max_length=150, blank=True)
+    generated_at = models.DateTimeField()
+    pdf_file = models.FileField(upload_to='project_reports/', blank=True, db_index=True)
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-generated_at']
+
+    def __str__(self):
+        return f"Archived report for {self.archived_project.title}"
+
+
+# ProjectSignature Model
+class ProjectSignature(models.Model):
+    """
+    MinHash signature of a project's title and description, used to find
+    near-duplicate submissions (see core/similarity.py).
+
+    Rows outlive archival: `project_id` then holds ArchivedProject.original_id,
+    so resubmissions can still be matched against past years. It is a plain
+    id rather than a foreign key for that reason.
+    """
+    project_id = models.BigIntegerField(unique=True)
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Signature for project {self.project_id}"
+
+
+# LSHBucket Model
+class LSHBucket(models.Model):
+    """
+    One locality-sensitive hashing band of a project's signature. Projects
+    sharing a (band, bucket) pair are candidate duplicates. Kept for archived
+    projects, like ProjectSignature.
+    """
+    project_id = models.BigIntegerField(db_index=True)
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        unique_together = [('project_id', 'band')]
+        indexes = [
+            # bucket first: collision lookups filter on bucket alone
+            models.Index(fields=['bucket', 'band'], name='lsh_bucket_idx'),
+        ]
+
+    def __str__(self):
+        return f"Band {self.band} bucket {self.bucket} (project {self.project_id})"
+
+
+# ChangeEvent Model
+class ChangeEvent(models.Model):
+    """
+    Append-only log of project and review changes, written by model signals
+    in the same transaction as the change. The auto-increment id is the
+    offset consumers resume from (see core/changefeed.py).
+    """
+    id = models.BigAutoField(primary_key=True)
+    event_type = models.CharField(max_length=50)
+    project_id = models.BigIntegerField(help_text="Project the event refers to (kept after the project is deleted)")
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"#{self.id} {self.event_type} (project {self.project_id})"
+
+
+# ChangeFeedCursor Model
+class ChangeFeedCursor(models.Model):
+    """Last ChangeEvent id each downstream consumer has processed."""
+    consumer = models.CharField(max_length=100, unique=True)
+    position = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.consumer} @ {self.position}"
+
+
+# ReviewEvent Model
+class ReviewEvent(models.Model):
+    """
+    Append-only history of review decisions, one row per review, written in
+    the same transaction as the review itself (see core/reviews.py).
+
+    Foreign keys are unconstrained and never cascade, so history outlives
+    archived or deleted projects and faculty.
+    """
+    SOURCE_REVIEW = 'R'
+    SOURCE_BACKFILL = 'B'
+    SOURCE_CHOICES = [
+        (SOURCE_REVIEW, 'Review'),
+        (SOURCE_BACKFILL, 'Backfilled from report'),
+    ]
+
+    project = models.ForeignKey(
+        Project, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='review_events'
+    )
+    faculty = models.ForeignKey(
+        FacultyProfile, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+        null=True, blank=True, related_name='review_events'
+    )
+    status = models.CharField(max_length=1, choices=Project.STATUS_CHOICES)
+    remarks = models.TextField(blank=True)
+    reviewed_at = models.DateTimeField()
+    source = models.CharField(max_length=1, choices=SOURCE_CHOICES, default=SOURCE_REVIEW)
+
+    class Meta:
+        ordering = ['-reviewed_at', '-id']
+        # the composite indexes also serve plain lookups by project / faculty
+        indexes = [
+            # timeline keyset scans: WHERE project_id = ? ORDER BY reviewed_at DESC, id DESC
+            models.Index(fields=['project', '-reviewed_at', '-id'], name='review_project_time_idx'),
+            models.Index(fields=['faculty', '-reviewed_at', '-id'], name='review_faculty_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_status_display()} for project {self.project_id} at {self.reviewed_at:%Y-%m-%d %H:%M}"
+
+
+# AdmissionCounter Model
+class AdmissionCounter(models.Model):
+    """
+    Admission control counters per endpoint (see core/admission.py),
+    incremented with a single UPDATE so concurrent requests are all counted.
+    """
+    endpoint = models.CharField(max_length=100)
+    metric = models.CharField(max_length=30)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = [('endpoint', 'metric')]
+
+    def __str__(self):
+        return f"{self.endpoint} {self.metric}: {self.count}"
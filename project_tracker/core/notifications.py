@@ -0,0 +1,129 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import NotificationOutbox, Project
+
+
+def enqueue_status_change(project):
+    """
+    Queue an email telling the student their project was approved or
+    rejected. Call inside the transaction that saves the new status.
+    """
+    student_user = project.student.user
+    reviewer = project.faculty_reviewer.user.username if project.faculty_reviewer else 'faculty'
+    body = f'Your project "{project.title}" was {project.get_status_display().lower()} by {reviewer}.'
+    if project.faculty_remarks:
+        body += f'\n\nRemarks:\n{project.faculty_remarks}'
+    return NotificationOutbox.objects.create(
+        recipient=student_user,
+        subject=f'Project {project.get_status_display().lower()}: {project.title}',
+        body=body,
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base, ... capped at OUTBOX_RETRY_MAX_SECONDS."""
+    seconds = settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1))
+    return timedelta(seconds=min(seconds, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+def _claim_due_messages(batch_size, now):
+    """
+    Lock a batch of due messages and push their next attempt into the future,
+    so concurrent workers do not pick them up while this one is sending.
+    """
+    with transaction.atomic():
+        messages = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=NotificationOutbox.STATUS_PENDING, next_attempt_at__lte=now)
+            .select_related('recipient')
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if messages:
+            NotificationOutbox.objects.filter(pk__in=[m.pk for m in messages]).update(
+                next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+            )
+    return messages
+
+
+def build_digest(recipient, messages):
+    """Combine all pending messages for one recipient into a single email."""
+    if len(messages) == 1:
+        subject = messages[0].subject
+    else:
+        subject = f'{len(messages)} updates on your projects'
+    body = '\n\n----------\n\n'.join(m.body for m in messages)
+    return EmailMessage(subject=subject, body=body, to=[recipient.email])
+
+
+def drain_outbox(batch_size=None, now=None):
+    """
+    Deliver one batch of due outbox messages as per-recipient digests over a
+    single mail connection. Failed digests are retried with exponential
+    backoff until OUTBOX_MAX_ATTEMPTS. Returns counts per outcome.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    now = now or timezone.now()
+    stats = {'sent': 0, 'digests': 0, 'retried': 0, 'failed': 0, 'skipped': 0}
+
+    by_recipient = defaultdict(list)
+    for message in _claim_due_messages(batch_size, now):
+        by_recipient[message.recipient].append(message)
+    if not by_recipient:
+        return stats
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # the batch is already leased: count the attempt so it backs off
+        for messages in by_recipient.values():
+            _record_failure(messages, str(e), now, stats)
+        return stats
+    try:
+        for recipient, messages in by_recipient.items():
+            ids = [m.pk for m in messages]
+            if not recipient.email:
+                NotificationOutbox.objects.filter(pk__in=ids).update(status=NotificationOutbox.STATUS_SKIPPED)
+                stats['skipped'] += len(ids)
+                continue
+            try:
+                digest = build_digest(recipient, messages)
+                digest.connection = connection
+                digest.send()
+            except Exception as e:
+                _record_failure(messages, str(e), now, stats)
+                continue
+            NotificationOutbox.objects.filter(pk__in=ids).update(
+                status=NotificationOutbox.STATUS_SENT, sent_at=timezone.now(), last_error='',
+            )
+            stats['sent'] += len(ids)
+            stats['digests'] += 1
+    finally:
+        connection.close()
+    return stats
+
+
+def _record_failure(messages, error, now, stats):
+    for message in messages:
+        message.attempts += 1
+        message.last_error = error[:1000]
+        if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            message.status = NotificationOutbox.STATUS_FAILED
+            stats['failed'] += 1
+        else:
+            message.next_attempt_at = now + retry_delay(message.attempts)
+            stats['retried'] += 1
+    NotificationOutbox.objects.bulk_update(messages, ['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def notify_on_review(project, previous_status):
+    """Queue a notification when a review moved the project to approved/rejected."""
+    if project.status != previous_status and project.status != Project.STATUS_PENDING:
+        return enqueue_status_change(project)
+    return None
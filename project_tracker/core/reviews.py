@@ -0,0 +1,212 @@
+"""
+Review history: recording, timeline queries and backfill.
+
+Timelines are read with keyset pagination on (reviewed_at, id). The page
+window is selected from the (project|faculty, reviewed_at, id) index alone,
+and only the rows on the page are then fetched by primary key, so the cost
+of a page does not grow with the size of the history.
+"""
+import base64
+import re
+import zlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Project, ProjectReport, ReviewEvent
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_STATUS_CODES = {label: code for code, label in Project.STATUS_CHOICES}
+
+
+def record_review(project, reviewed_at=None):
+    """Append the project's current decision to its history."""
+    return ReviewEvent.objects.create(
+        project=project,
+        faculty_id=project.faculty_reviewer_id,
+        status=project.status,
+        remarks=project.faculty_remarks,
+        reviewed_at=reviewed_at or timezone.now(),
+    )
+
+
+# ========== TIMELINES ==========
+
+def encode_cursor(event):
+    micros = (event.reviewed_at - _EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f"{micros}.{event.id}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (reviewed_at, id) from a cursor; raises ValueError if malformed."""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    micros, event_id = base64.urlsafe_b64decode(padded.encode()).decode().split('.')
+    return _EPOCH + timedelta(microseconds=int(micros)), int(event_id)
+
+
+def timeline(queryset, cursor=None, limit=50):
+    """
+    One page of `queryset` (already filtered to a project or faculty member),
+    newest first. Returns (events, next_cursor).
+    """
+    if cursor:
+        reviewed_at, event_id = decode_cursor(cursor)
+        # the redundant lte bound lets the index serve this as a range scan
+        queryset = queryset.filter(
+            Q(reviewed_at__lt=reviewed_at) | Q(reviewed_at=reviewed_at, id__lt=event_id),
+            reviewed_at__lte=reviewed_at,
+        )
+    window = list(queryset.order_by('-reviewed_at', '-id').values_list('id', flat=True)[:limit + 1])
+    page_ids = window[:limit]
+    events = sorted(
+        ReviewEvent.objects.filter(id__in=page_ids),
+        key=lambda e: (e.reviewed_at, e.id), reverse=True,
+    )
+    next_cursor = encode_cursor(events[-1]) if len(window) > limit else None
+    return events, next_cursor
+
+
+# ========== BACKFILL ==========
+
+_PDF_STREAM_RE = re.compile(rb'stream\r?\n(.*?)endstream', re.S)
+_PDF_TEXT_RE = re.compile(rb'\(((?:\\.|[^\\)])*)\)\s*Tj|T\*|ET')
+_PDF_ESCAPE_RE = re.compile(rb'\\([0-7]{1,3}|.)', re.S)
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+
+def _unescape_pdf_string(raw):
+    def replace(match):
+        token = match.group(1)
+        if token[:1].isdigit():
+            return bytes([int(token, 8) & 0xFF])
+        return _PDF_ESCAPES.get(token, token)
+    return _PDF_ESCAPE_RE.sub(replace, raw).decode('cp1252', errors='replace')
+
+
+def _pdf_text_lines(data):
+    """Text lines drawn by the generate_report view, in drawing order."""
+    lines = []
+    for match in _PDF_STREAM_RE.finditer(data):
+        stream = match.group(1).strip()
+        if stream.endswith(b'~>'):
+            stream = stream[:-2]
+        try:
+            content = zlib.decompress(base64.a85decode(stream))
+        except (ValueError, zlib.error):
+            try:
+                content = zlib.decompress(stream)
+            except zlib.error:
+                content = stream
+        current = None
+        for token in _PDF_TEXT_RE.finditer(content):
+            if token.group(1) is not None:
+                current = _unescape_pdf_string(token.group(1))
+            elif token.group(0) == b'T*':
+                lines.append(current or '')
+                current = None
+            elif current is not None:
+                lines.append(current)
+                current = None
+    return lines
+
+
+def read_report_snapshot(report):
+    """
+    (status, remarks) as printed in a generated report PDF, or None if the
+    file is missing or not in the generate_report layout.
+    """
+    if not report.pdf_file:
+        return None
+    try:
+        with report.pdf_file.open('rb') as f:
+            lines = _pdf_text_lines(f.read())
+    except (OSError, ValueError):
+        return None
+
+    status = next((
+        _STATUS_CODES.get(line[len('Status: '):].strip())
+        for line in lines if line.startswith('Status: ')
+    ), None)
+    if status is None or 'Faculty Remarks:' not in lines:
+        return None
+    start = len(lines) - lines[::-1].index('Faculty Remarks:')
+    return status, '\n'.join(lines[start:]).strip()
+
+
+def _live_history(project_ids):
+    """Per project: (time of the first live review, set of live (status, remarks))."""
+    first_review, decisions = {}, {}
+    live = ReviewEvent.objects.filter(
+        source=ReviewEvent.SOURCE_REVIEW, project_id__in=project_ids,
+    ).values_list('project_id', 'reviewed_at', 'status', 'remarks')
+    for project_id, reviewed_at, status, remarks in live:
+        first_review[project_id] = min(reviewed_at, first_review.get(project_id, reviewed_at))
+        decisions.setdefault(project_id, set()).add((status, remarks))
+    return first_review, decisions
+
+
+def backfill_from_reports(batch_size=500):
+    """
+    Rebuild history for reviews made before history was recorded, from the
+    ProjectReport PDFs, which snapshot status and remarks at generation time.
+
+    Only reports older than a project's first live review are used, and
+    snapshots matching a live review are skipped, so re-running never
+    duplicates live history. Consecutive identical snapshots of a project
+    collapse into one event. Reports do not record who reviewed, so the
+    reviewer is only filled in when the snapshot is the project's current
+    decision. Previously backfilled rows are replaced. Returns the number of
+    events written.
+    """
+    ReviewEvent.objects.filter(source=ReviewEvent.SOURCE_BACKFILL).delete()
+    written = 0
+    last = None
+    last_key = (0, _EPOCH, 0)
+    while True:
+        project_id, generated_at, report_id = last_key
+        reports = list(
+            ProjectReport.objects.filter(
+                Q(project_id__gt=project_id)
+                | Q(project_id=project_id, generated_at__gt=generated_at)
+                | Q(project_id=project_id, generated_at=generated_at, id__gt=report_id)
+            ).order_by('project_id', 'generated_at', 'id')[:batch_size]
+        )
+        if not reports:
+            return written
+        project_ids = {report.project_id for report in reports}
+        first_review, decisions = _live_history(project_ids)
+        current = {
+            pk: ((status, remarks), reviewer_id)
+            for pk, status, remarks, reviewer_id in Project.objects.filter(id__in=project_ids)
+            .values_list('id', 'status', 'faculty_remarks', 'faculty_reviewer_id')
+        }
+        events = []
+        for report in reports:
+            cutoff = first_review.get(report.project_id)
+            if cutoff is not None and report.generated_at >= cutoff:
+                continue
+            snapshot = read_report_snapshot(report)
+            if snapshot is None or snapshot[0] == Project.STATUS_PENDING:
+                continue
+            if snapshot in decisions.get(report.project_id, ()):
+                continue
+            key = (report.project_id,) + snapshot
+            if key == last:
+                continue
+            last = key
+            decision, reviewer_id = current.get(report.project_id, (None, None))
+            events.append(ReviewEvent(
+                project_id=report.project_id,
+                faculty_id=reviewer_id if decision == snapshot else None,
+                status=snapshot[0],
+                remarks=snapshot[1],
+                reviewed_at=report.generated_at,
+                source=ReviewEvent.SOURCE_BACKFILL,
+            ))
+        with transaction.atomic():
+            ReviewEvent.objects.bulk_create(events)
+        written += len(events)
+        tail = reports[-1]
+        last_key = (tail.project_id, tail.generated_at, tail.id)
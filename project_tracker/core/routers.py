@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# Per-request routing state set by ReplicaRoutingMiddleware:
+# {'replica': may reads use the replica, 'wrote': did this request write}
+_routing_state = ContextVar('routing_state', default=None)
+
+PIN_COOKIE = 'db_pin'
+PIN_SALT = 'core.routers.pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# alias -> True once the replica has a schema, else the time it was last checked
+_replica_status = {}
+REPLICA_RECHECK_SECONDS = 5
+
+
+def _has_schema(path):
+    if not path or not os.path.exists(path):
+        return False
+    # read-only URI: never create an empty file the way a normal connect would
+    with closing(sqlite3.connect(f'file:{path}?mode=ro', uri=True)) as conn:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'django_migrations'"
+        ).fetchone()
+    return row is not None
+
+
+def replica_ready(alias):
+    """
+    True once `refresh_replica` has copied the schema into the replica.
+    Until then reads stay on the primary; the file is re-checked every
+    REPLICA_RECHECK_SECONDS.
+    """
+    status = _replica_status.get(alias)
+    if status is True:
+        return True
+    now = time.monotonic()
+    if status is not None and now - status < REPLICA_RECHECK_SECONDS:
+        return False
+    try:
+        ready = _has_schema(settings.DATABASES.get(alias, {}).get('NAME'))
+    except sqlite3.Error:
+        ready = False
+    _replica_status[alias] = True if ready else now
+    return ready
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """
+    Route reads of replica-eligible models to the read alias inside the block,
+    until the first write. Yields the routing state.
+    """
+    state = {'replica': enabled, 'wrote': False}
+    token = _routing_state.set(state)
+    try:
+        yield state
+    finally:
+        _routing_state.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads of REPLICA_READ_APPS models to DATABASE_READ_ALIAS while a
+    request is allowed to use it; everything else goes to 'default'.
+
+    Sessions and auth always stay on the primary, so a replica that lags
+    behind can never log a user out.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = getattr(settings, 'DATABASE_READ_ALIAS', None)
+        state = _routing_state.get()
+        if not alias or not state or not state['replica']:
+            return 'default'
+        if model._meta.app_label not in getattr(settings, 'REPLICA_READ_APPS', ()):
+            return 'default'
+        if not replica_ready(alias):
+            return 'default'
+        return alias
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            # Once a request writes, it (and the client's next few requests)
+            # must see its own changes
+            state['wrote'] = True
+            state['replica'] = False
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so objects from either may be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema with the data from `refresh_replica`
+        return db == 'default'
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from the replica, except for a short window after
+    the same client wrote something (read-your-own-writes). Any non-safe
+    request, or safe request that ended up writing, sets the pin.
+
+    The pin is kept in a signed cookie rather than in the session, since
+    loading the session to check it would already need a database read.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'DATABASE_READ_ALIAS', None):
+            return self.get_response(request)
+
+        use_replica = request.method in SAFE_METHODS and not self._is_pinned(request)
+        with replica_reads(use_replica) as state:
+            response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS or state['wrote']:
+            response.set_signed_cookie(
+                PIN_COOKIE, '1', salt=PIN_SALT,
+                max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax',
+            )
+        return response
+
+    def _is_pinned(self, request):
+        return request.get_signed_cookie(
+            PIN_COOKIE, default=None, salt=PIN_SALT, max_age=settings.REPLICA_PIN_SECONDS,
+        ) is not None
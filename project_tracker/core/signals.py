@@ -0,0 +1,91 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import changefeed
+from .archive import is_archived
+from .models import Project, ProjectReport
+from .similarity import drop_from_index
+from .storage import delete_if_orphaned
+
+
+@receiver(pre_save, sender=Project)
+def remember_previous_state(sender, instance, **kwargs):
+    # Stash the stored values post_save needs to detect what changed
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = (
+            Project.objects.filter(pk=instance.pk)
+            .values('attachment', 'status', 'faculty_remarks')
+            .first()
+        )
+
+
+# ========== MEDIA CLEANUP ==========
+
+@receiver(post_save, sender=Project)
+def delete_replaced_attachment(sender, instance, **kwargs):
+    previous = (getattr(instance, '_previous_state', None) or {}).get('attachment')
+    if previous and previous != instance.attachment.name:
+        delete_if_orphaned(previous, instance.attachment.storage)
+
+
+@receiver(post_delete, sender=Project)
+def delete_project_attachment(sender, instance, **kwargs):
+    delete_if_orphaned(instance.attachment.name, instance.attachment.storage)
+
+
+@receiver(post_delete, sender=ProjectReport)
+def delete_report_file(sender, instance, **kwargs):
+    delete_if_orphaned(instance.pdf_file.name, instance.pdf_file.storage)
+
+
+# ========== SIMILARITY INDEX ==========
+
+@receiver(post_delete, sender=Project)
+def drop_deleted_project_from_index(sender, instance, **kwargs):
+    # archived projects stay indexed so later resubmissions are still flagged
+    if not is_archived(instance.pk):
+        drop_from_index(instance.pk)
+
+
+# ========== CHANGE FEED ==========
+
+@receiver(post_save, sender=Project)
+def record_project_changes(sender, instance, created, **kwargs):
+    if created:
+        changefeed.record_event(
+            changefeed.PROJECT_CREATED, instance.pk,
+            student=instance.student_id, title=instance.title, status=instance.status,
+        )
+        return
+    previous = getattr(instance, '_previous_state', None)
+    if not previous:
+        return
+    if previous['status'] != instance.status:
+        changefeed.record_event(
+            changefeed.PROJECT_STATUS_CHANGED, instance.pk,
+            old=previous['status'], new=instance.status, reviewer=instance.faculty_reviewer_id,
+        )
+    if previous['faculty_remarks'] != instance.faculty_remarks:
+        changefeed.record_event(
+            changefeed.PROJECT_REMARKS_CHANGED, instance.pk,
+            remarks=instance.faculty_remarks, reviewer=instance.faculty_reviewer_id,
+        )
+
+
+@receiver(post_delete, sender=Project)
+def record_project_deleted(sender, instance, **kwargs):
+    # archive_batch deletes projects too; consumers must not treat that as a deletion
+    if is_archived(instance.pk):
+        changefeed.record_event(changefeed.PROJECT_ARCHIVED, instance.pk)
+    else:
+        changefeed.record_event(changefeed.PROJECT_DELETED, instance.pk)
+
+
+@receiver(post_save, sender=ProjectReport)
+def record_report_created(sender, instance, created, **kwargs):
+    if created:
+        changefeed.record_event(
+            changefeed.REPORT_CREATED, instance.project_id,
+            report=instance.pk, generated_by=instance.generated_by_id,
+        )
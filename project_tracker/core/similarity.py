@@ -0,0 +1,264 @@
+"""
+Near-duplicate project detection with MinHash signatures and an LSH index.
+
+Each project's title + description is reduced to a set of word shingles and
+summarised by NUM_PERM min-hashes. The signature is split into BANDS bands
+of ROWS rows; projects whose band hashes collide in at least one band are
+candidates, and their estimated Jaccard similarity is then checked against
+SIMILARITY_THRESHOLD. Lookups therefore touch only colliding buckets instead
+of comparing every pair of projects.
+"""
+import functools
+import hashlib
+import random
+import re
+import struct
+import zlib
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import ArchivedProject, LSHBucket, Project, ProjectSignature
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = (1 << 32) + 15
+_MAX_HASH = (1 << 32) - 1
+# a < 2**31 keeps a * x + b below 2**64, so NumPy uint64 maths is exact
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, 1 << 31), _rng.randrange(0, 1 << 31)) for _ in range(NUM_PERM)]
+_SIGNATURE_FORMAT = f'<{NUM_PERM}I'
+_WORD_RE = re.compile(r'\w+')
+
+
+def shingles(text):
+    """Hashed word n-grams of the normalised text."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    return {zlib.crc32(gram.encode()) for gram in grams}
+
+
+def project_text(project):
+    return f"{project.title}\n{project.description}"
+
+
+def compute_signature(text):
+    """MinHash signature of `text` as a list of NUM_PERM ints."""
+    hashed = shingles(text)
+    if not hashed:
+        return [_MAX_HASH] * NUM_PERM
+    return [
+        min(((a * x + b) % _PRIME) & _MAX_HASH for x in hashed)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def compute_signatures(texts):
+    """compute_signature for each of `texts`."""
+    return [compute_signature(text) for text in texts]
+
+
+@functools.lru_cache(maxsize=None)
+def batch_signature_function():
+    """
+    compute_signatures, vectorized across a whole batch of documents with
+    NumPy when it is installed. NumPy is imported here rather than at module
+    level so web workers never load it.
+    """
+    try:
+        import numpy as np
+    except ImportError:  # optional dependency: speeds up rebuild_similarity_index
+        return compute_signatures
+
+    multipliers = np.array([a for a, _ in _PERMUTATIONS], dtype=np.uint64)[:, None]
+    offsets = np.array([b for _, b in _PERMUTATIONS], dtype=np.uint64)[:, None]
+
+    def compute_signatures_vectorized(texts):
+        """
+        Same result as compute_signatures. The shingles of all documents are
+        hashed by all permutations in one (NUM_PERM x total shingles) array,
+        then reduced to per-document minimums with minimum.reduceat.
+        """
+        hashed = [shingles(text) for text in texts]
+        non_empty = [i for i, h in enumerate(hashed) if h]
+        signatures = [[_MAX_HASH] * NUM_PERM for _ in texts]
+        if not non_empty:
+            return signatures
+        sizes = [len(hashed[i]) for i in non_empty]
+        x = np.fromiter(
+            (value for i in non_empty for value in hashed[i]), dtype=np.uint64, count=sum(sizes),
+        )[None, :]
+        values = ((multipliers * x + offsets) % np.uint64(_PRIME)) & np.uint64(_MAX_HASH)
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        minimums = np.minimum.reduceat(values, starts, axis=1).T.tolist()
+        for i, signature in zip(non_empty, minimums):
+            signatures[i] = signature
+        return signatures
+
+    return compute_signatures_vectorized
+
+
+def pack_signature(signature):
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data):
+    return struct.unpack(_SIGNATURE_FORMAT, bytes(data))
+
+
+def band_buckets(signature):
+    """(band, bucket) pairs for the LSH index."""
+    packed = pack_signature(signature)
+    pairs = []
+    for band in range(BANDS):
+        rows = packed[band * ROWS * 4:(band + 1) * ROWS * 4]
+        digest = hashlib.blake2b(rows, digest_size=8).digest()
+        pairs.append((band, int.from_bytes(digest, 'big', signed=True)))
+    return pairs
+
+
+def estimated_similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity: the fraction of matching min-hashes."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def _index_rows(project_id, signature):
+    buckets = [LSHBucket(project_id=project_id, band=band, bucket=bucket) for band, bucket in band_buckets(signature)]
+    return ProjectSignature(project_id=project_id, signature=pack_signature(signature)), buckets
+
+
+def index_project(project):
+    """(Re)index one project; call after each submission or edit."""
+    signature = compute_signature(project_text(project))
+    with transaction.atomic():
+        ProjectSignature.objects.update_or_create(
+            project_id=project.id, defaults={'signature': pack_signature(signature)},
+        )
+        LSHBucket.objects.filter(project_id=project.id).delete()
+        _, buckets = _index_rows(project.id, signature)
+        LSHBucket.objects.bulk_create(buckets)
+
+
+def _index_batches(queryset, id_field, batch_size):
+    """Yield (id, title, description) batches of `queryset`, keyed by `id_field`."""
+    last_id = 0
+    while True:
+        batch = list(
+            queryset.filter(**{f'{id_field}__gt': last_id}).order_by(id_field)
+            .values_list(id_field, 'title', 'description')[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1][0]
+
+
+def rebuild_index(batch_size=500):
+    """
+    Recompute every signature and bucket from scratch, batch by batch, for
+    live projects and archived ones (keyed by their original id). Uses NumPy
+    for the signature maths when it is installed. Returns the number of
+    projects indexed.
+    """
+    sign = batch_signature_function()
+    with transaction.atomic():
+        LSHBucket.objects.all().delete()
+        ProjectSignature.objects.all().delete()
+        total = 0
+        sources = (
+            (Project.objects.all(), 'id'),
+            (ArchivedProject.objects.all(), 'original_id'),
+        )
+        for queryset, id_field in sources:
+            for batch in _index_batches(queryset, id_field, batch_size):
+                signatures, buckets = [], []
+                texts = [f"{title}\n{description}" for _, title, description in batch]
+                for (project_id, _, _), signature in zip(batch, sign(texts)):
+                    row, project_buckets = _index_rows(project_id, signature)
+                    signatures.append(row)
+                    buckets.extend(project_buckets)
+                ProjectSignature.objects.bulk_create(signatures)
+                LSHBucket.objects.bulk_create(buckets)
+                total += len(batch)
+        return total
+
+
+def drop_from_index(project_id):
+    """Remove a deleted project's signature and buckets."""
+    LSHBucket.objects.filter(project_id=project_id).delete()
+    ProjectSignature.objects.filter(project_id=project_id).delete()
+
+
+def index_state(project_ids):
+    """
+    (last change, row count) of the signatures find_duplicates(project_ids)
+    can reach, i.e. those sharing a bucket with one of `project_ids` (a list
+    or an id queryset). A cheap validator for pages that show duplicate flags.
+    """
+    own_buckets = LSHBucket.objects.filter(project_id__in=project_ids).values('bucket')
+    reachable = LSHBucket.objects.filter(bucket__in=own_buckets).values('project_id')
+    state = ProjectSignature.objects.filter(project_id__in=reachable).aggregate(
+        changed=Max('updated_at'), count=Count('id'),
+    )
+    return state['changed'], state['count']
+
+
+def find_duplicates(project_ids, threshold=None):
+    """
+    Candidate duplicates for each of `project_ids`, as
+    {project_id: [(other, similarity), ...]} ordered by similarity, where
+    `other` is a Project or, for archived projects, an ArchivedProject.
+    """
+    threshold = settings.SIMILARITY_THRESHOLD if threshold is None else threshold
+    project_ids = list(project_ids)
+    own = list(LSHBucket.objects.filter(project_id__in=project_ids).values_list('project_id', 'band', 'bucket'))
+    if not own:
+        return {}
+
+    keys_by_project = defaultdict(set)
+    for project_id, band, bucket in own:
+        keys_by_project[project_id].add((band, bucket))
+    collisions = LSHBucket.objects.filter(
+        bucket__in={bucket for _, _, bucket in own}
+    ).exclude(project_id__in=project_ids).values_list('project_id', 'band', 'bucket')
+    # projects on the same page can be duplicates of each other too
+    collisions = list(collisions) + own
+
+    candidates = defaultdict(set)
+    by_key = defaultdict(set)
+    for other_id, band, bucket in collisions:
+        by_key[(band, bucket)].add(other_id)
+    for project_id, keys in keys_by_project.items():
+        for key in keys:
+            candidates[project_id].update(by_key[key] - {project_id})
+
+    involved = set(candidates) | {other for others in candidates.values() for other in others}
+    signatures = {
+        pid: unpack_signature(data)
+        for pid, data in ProjectSignature.objects.filter(project_id__in=involved).values_list('project_id', 'signature')
+    }
+    other_ids = {other for others in candidates.values() for other in others}
+    others = Project.objects.select_related('student').in_bulk(other_ids)
+    # index rows of archived projects are keyed by their original id
+    others.update(ArchivedProject.objects.in_bulk(other_ids - set(others), field_name='original_id'))
+
+    result = {}
+    for project_id, other_ids in candidates.items():
+        matches = []
+        for other_id in other_ids:
+            if project_id not in signatures or other_id not in signatures or other_id not in others:
+                continue
+            similarity = estimated_similarity(signatures[project_id], signatures[other_id])
+            if similarity >= threshold:
+                matches.append((others[other_id], similarity))
+        if matches:
+            result[project_id] = sorted(matches, key=lambda m: m[1], reverse=True)
+    return result
@@ -0,0 +1,108 @@
+import posixpath
+import uuid
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import transaction
+
+
+# Upload directories managed by the platform (see Project.attachment and
+# ProjectReport.pdf_file). The orphan collector only ever looks inside these.
+MEDIA_PREFIXES = ('project_attachments', 'project_reports')
+
+# Every model field that can point at a file in MEDIA_PREFIXES, as
+# (app_label.ModelName, field_name). A stored file is orphaned once none of
+# these reference it.
+FILE_REFERENCES = [
+    ('core.Project', 'attachment'),
+    ('core.ProjectReport', 'pdf_file'),
+    ('core.ArchivedProject', 'attachment'),
+    ('core.ArchivedProjectReport', 'pdf_file'),
+]
+
+
+class ShardedFileSystemStorage(FileSystemStorage):
+    """
+    FileSystemStorage that spreads uploads over hashed subdirectories.
+
+    'project_attachments/report.pdf' is stored as
+    'project_attachments/3f/a9/report.pdf', so each directory holds at most
+    a few files no matter how many uploads accumulate.
+    """
+    shard_depth = 2
+
+    def generate_filename(self, filename):
+        filename = super().generate_filename(filename)
+        dirname, basename = posixpath.split(filename)
+        if dirname.split('/')[0] not in MEDIA_PREFIXES:
+            return filename
+        token = uuid.uuid4().hex
+        shards = [token[i * 2:i * 2 + 2] for i in range(self.shard_depth)]
+        return posixpath.join(dirname, *shards, basename)
+
+
+def iter_stored_files(storage, prefix):
+    """
+    Walk a storage directory depth-first, yielding file names one at a time
+    so that huge trees never have to be listed in full.
+    """
+    pending = [prefix]
+    while pending:
+        directory = pending.pop()
+        try:
+            dirs, files = storage.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for name in files:
+            yield posixpath.join(directory, name)
+        pending.extend(posixpath.join(directory, d) for d in dirs)
+
+
+def referenced_names(names):
+    """
+    Return the subset of `names` that is still referenced by a model row.
+    Every file column in FILE_REFERENCES is indexed, so this is one index
+    lookup per name and table.
+    """
+    names = list(names)
+    found = set()
+    for model_label, field_name in FILE_REFERENCES:
+        model = apps.get_model(model_label)
+        found.update(
+            model.objects.filter(**{f'{field_name}__in': names})
+            .values_list(field_name, flat=True)
+        )
+    return found
+
+
+def delete_if_orphaned(name, storage=None):
+    """
+    Delete a stored file once the current transaction commits, unless some
+    other row still points at it.
+    """
+    if not name:
+        return
+    storage = storage or default_storage
+
+    def _delete():
+        if not referenced_names([name]) and storage.exists(name):
+            storage.delete(name)
+
+    transaction.on_commit(_delete)
+
+
+def file_size(storage, name):
+    """Size of a stored file, or 0 if it vanished in the meantime."""
+    try:
+        return storage.size(name)
+    except OSError:
+        return 0
+
+
+def is_older_than(storage, name, cutoff):
+    """True when the file was last modified before `cutoff` (aware datetime)."""
+    try:
+        return storage.get_modified_time(name) < cutoff
+    except (OSError, NotImplementedError):
+        # Without a timestamp we cannot prove the upload is settled; keep it.
+        return False
@@ -1,6 +1,33 @@
-from django.test import TestCase, Client
+import gzip
+import importlib.util
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+from django.test import TestCase, TransactionTestCase, Client, override_settings
 from django.contrib.auth.models import User, Group
-from .models import StudentProfile, FacultyProfile, Project
+from . import admission, similarity
+from .assignment import assign_reviewer, rebalance, review_queue
+from .models import (
+    StudentProfile, FacultyProfile, Project, ProjectReport, NotificationOutbox, ArchivedProject,
+    ProjectSignature, LSHBucket, ChangeEvent, ChangeFeedCursor, ReviewEvent,
+)
+from .archive import archive_batch
+from .similarity import BANDS, find_duplicates, index_project, index_state
+from .notifications import drain_outbox
+from .reviews import record_review
+from .routers import PIN_COOKIE, PrimaryReplicaRouter, replica_reads, replica_ready
 
 
 class StudentProfileTestCase(TestCase):
@@ -83,3 +110,629 @@ class CoreModelsAndViewsTest(TestCase):
         # review project
         resp = self.client.post('/faculty/dashboard/', {'project_id': project.id, 'status': Project.STATUS_APPROVED, 'faculty_remarks': 'Good'})
         self.assertEqual(resp.status_code, 302)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class MediaStorageTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='stud_media', password='pass')
+        self.student = StudentProfile.objects.create(user=self.user, register_number='MED1', department='CSE', year=2)
+
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def test_uploads_are_sharded(self):
+        project = Project.objects.create(student=self.student, title='Sharded', domain='AI', description='D')
+        project.attachment.save('notes.txt', ContentFile(b'hello'))
+        parts = project.attachment.name.split('/')
+        self.assertEqual(parts[0], 'project_attachments')
+        self.assertEqual(len(parts), 4)
+        self.assertEqual(parts[-1], 'notes.txt')
+
+    def test_deleting_project_removes_attachment(self):
+        project = Project.objects.create(student=self.student, title='Gone', domain='AI', description='D')
+        project.attachment.save('gone.txt', ContentFile(b'bye'))
+        name = project.attachment.name
+        self.assertTrue(default_storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertFalse(default_storage.exists(name))
+
+    def test_collect_orphan_media(self):
+        project = Project.objects.create(student=self.student, title='Kept', domain='AI', description='D')
+        project.attachment.save('kept.txt', ContentFile(b'keep'))
+        orphan = default_storage.save('project_reports/orphan.pdf', ContentFile(b'12345'))
+
+        out = io.StringIO()
+        call_command('collect_orphan_media', '--dry-run', '--grace-minutes=-1', stdout=out)
+        self.assertIn('Would reclaim 5 bytes', out.getvalue())
+        self.assertTrue(default_storage.exists(orphan))
+
+        call_command('collect_orphan_media', '--grace-minutes=-1', stdout=io.StringIO())
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(project.attachment.name))
+
+
+class ReviewerAssignmentTest(TestCase):
+    def setUp(self):
+        self.student_group, _ = Group.objects.get_or_create(name='Student')
+        user = User.objects.create_user(username='stud_assign', password='pass')
+        user.groups.add(self.student_group)
+        self.student = StudentProfile.objects.create(user=user, register_number='ASG1', department='CSE', year=3)
+        self.faculty = []
+        for i, cap in enumerate((2, 5)):
+            fac_user = User.objects.create_user(username=f'fac_assign{i}', password='pass')
+            self.faculty.append(FacultyProfile.objects.create(
+                user=fac_user, employee_id=f'ASG{i}', department='cse', designation='Professor', max_open_reviews=cap))
+        other = User.objects.create_user(username='fac_ece', password='pass')
+        FacultyProfile.objects.create(user=other, employee_id='ECE1', department='ECE', designation='Professor')
+
+    def _project(self, title, reviewer=None):
+        return Project.objects.create(student=self.student, title=title, domain='AI', description='D', faculty_reviewer=reviewer)
+
+    def test_submission_is_assigned_to_least_loaded_faculty(self):
+        self._project('Existing', reviewer=self.faculty[0])
+        self.client.login(username='stud_assign', password='pass')
+        self.client.post('/student/dashboard/', {'title': 'New Project', 'domain': 'AI', 'description': 'A long enough description'})
+        self.assertEqual(Project.objects.get(title='New Project').faculty_reviewer, self.faculty[1])
+
+    def test_rebalance_respects_caps_and_spreads_load(self):
+        for i in range(6):
+            self._project(f'P{i}', reviewer=self.faculty[0])
+        summaries = rebalance()
+        loads = {f.id: f.reviewed_projects.filter(status=Project.STATUS_PENDING).count() for f in self.faculty}
+        self.assertEqual(loads, {self.faculty[0].id: 2, self.faculty[1].id: 4})
+        self.assertEqual(summaries[0]['reassigned'], 4)
+        self.assertEqual(summaries[0]['unassigned'], 0)
+
+    def test_padded_student_department_reaches_faculty_queue(self):
+        self.student.department = 'CSE '
+        self.student.save()
+        project = self._project('Padded')
+        self.assertIn(project, review_queue(self.faculty[0]))
+        self.assertEqual(assign_reviewer(project), self.faculty[0])
+
+
+class ReplicaRoutingTest(TestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    @override_settings(DATABASE_READ_ALIAS='replica')
+    @mock.patch('core.routers.replica_ready', return_value=True)
+    def test_reads_use_replica_until_first_write(self, _):
+        self.assertEqual(self.router.db_for_read(Project), 'default')
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Project), 'replica')
+            # auth and sessions never leave the primary
+            self.assertEqual(self.router.db_for_read(User), 'default')
+            self.router.db_for_write(Project)
+            self.assertEqual(self.router.db_for_read(Project), 'default')
+
+    @override_settings(DATABASE_READ_ALIAS='replica')
+    def test_post_pins_client_to_primary(self):
+        resp = self.client.post('/login/', {'username': 'nobody', 'password': 'x'})
+        self.assertIn(PIN_COOKIE, resp.cookies)
+
+
+class RefreshReplicaTest(TransactionTestCase):
+    def test_refresh_replica_copies_primary(self):
+        user = User.objects.create_user(username='stud_replica', password='pass')
+        StudentProfile.objects.create(user=user, register_number='REP1', department='CSE', year=1)
+        target = os.path.join(tempfile.mkdtemp(), 'replica.sqlite3')
+        with mock.patch.dict(settings.DATABASES, {'replica_check': {'NAME': target}}), \
+                mock.patch('core.routers.REPLICA_RECHECK_SECONDS', 0):
+            # not refreshed yet: reads stay on the primary and no empty file is created
+            self.assertFalse(replica_ready('replica_check'))
+            self.assertFalse(os.path.exists(target))
+            call_command('refresh_replica', target=target, stdout=io.StringIO())
+            self.assertTrue(replica_ready('replica_check'))
+        replica = sqlite3.connect(target)
+        try:
+            count = replica.execute(
+                "SELECT COUNT(*) FROM core_studentprofile WHERE register_number = 'REP1'").fetchone()[0]
+        finally:
+            replica.close()
+            shutil.rmtree(os.path.dirname(target), ignore_errors=True)
+        self.assertEqual(count, 1)
+
+
+class StartupProfileTest(TestCase):
+    def test_cold_start_stays_lazy(self):
+        out = io.StringIO()
+        call_command('profile_startup', runs=1, top=3, no_budget=True, stdout=out)
+        self.assertIn('Lazy modules stay unimported', out.getvalue())
+
+    @unittest.skipUnless(os.environ.get('STARTUP_BUDGET_CHECK'), 'set STARTUP_BUDGET_CHECK=1 to time cold starts')
+    def test_cold_start_within_budget(self):
+        out = io.StringIO()
+        call_command('profile_startup', runs=3, top=3, stdout=out)
+        self.assertIn('Within budget', out.getvalue())
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class NotificationOutboxTest(TestCase):
+    def setUp(self):
+        Group.objects.get_or_create(name='Faculty')
+        self.student_user = User.objects.create_user(username='stud_mail', password='pass', email='stud@example.com')
+        self.student = StudentProfile.objects.create(user=self.student_user, register_number='MAIL1', department='CSE', year=4)
+        fac_user = User.objects.create_user(username='fac_mail', password='pass')
+        fac_user.groups.add(Group.objects.get(name='Faculty'))
+        self.faculty = FacultyProfile.objects.create(user=fac_user, employee_id='MAILF', department='CSE', designation='Professor')
+
+    def test_review_queues_notification_and_drain_sends_digest(self):
+        p1 = Project.objects.create(student=self.student, title='First', domain='AI', description='D')
+        p2 = Project.objects.create(student=self.student, title='Second', domain='AI', description='D')
+        self.client.login(username='fac_mail', password='pass')
+        for p, status in ((p1, Project.STATUS_APPROVED), (p2, Project.STATUS_REJECTED)):
+            self.client.post('/faculty/dashboard/', {'project_id': p.id, 'status': status, 'faculty_remarks': 'ok'})
+        self.assertEqual(NotificationOutbox.objects.filter(recipient=self.student_user).count(), 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+        stats = drain_outbox()
+        self.assertEqual((stats['sent'], stats['digests']), (2, 1))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('First', mail.outbox[0].body)
+        self.assertIn('Second', mail.outbox[0].body)
+
+    def test_student_registered_through_the_app_gets_notified(self):
+        form = {'username': 'new_stud', 'password': 'pass', 'register_number': 'MAIL2', 'department': 'CSE', 'year': 1}
+        self.client.post('/register/student/', form)
+        self.assertFalse(User.objects.filter(username='new_stud').exists())
+        self.client.post('/register/student/', dict(form, email='new_stud@example.com'))
+
+        self.client.login(username='new_stud', password='pass')
+        self.client.post('/student/dashboard/', {'title': 'Registered', 'domain': 'AI', 'description': 'A long enough description'})
+        project = Project.objects.get(title='Registered')
+        self.client.login(username='fac_mail', password='pass')
+        self.client.post('/faculty/dashboard/', {'project_id': project.id, 'status': Project.STATUS_APPROVED, 'faculty_remarks': 'ok'})
+
+        self.assertEqual(drain_outbox()['sent'], 1)
+        self.assertEqual(mail.outbox[0].to, ['new_stud@example.com'])
+
+    def test_failed_delivery_backs_off(self):
+        message = NotificationOutbox.objects.create(recipient=self.student_user, subject='S', body='B')
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('smtp down')):
+            stats = drain_outbox()
+        message.refresh_from_db()
+        self.assertEqual(stats['retried'], 1)
+        self.assertEqual(message.attempts, 1)
+        self.assertEqual(message.status, NotificationOutbox.STATUS_PENDING)
+        self.assertGreater(message.next_attempt_at, timezone.now())
+        self.assertEqual(drain_outbox()['sent'], 0)
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=1)
+    def test_unreachable_mail_server_counts_as_attempt(self):
+        message = NotificationOutbox.objects.create(recipient=self.student_user, subject='S', body='B')
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=OSError('connection refused')):
+            stats = drain_outbox()
+        message.refresh_from_db()
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(message.status, NotificationOutbox.STATUS_FAILED)
+        self.assertIn('connection refused', message.last_error)
+
+
+class ProjectAPITest(TestCase):
+    def setUp(self):
+        student_group, _ = Group.objects.get_or_create(name='Student')
+        faculty_group, _ = Group.objects.get_or_create(name='Faculty')
+        user = User.objects.create_user(username='stud_api', password='pass')
+        user.groups.add(student_group)
+        self.student = StudentProfile.objects.create(user=user, register_number='API1', department='CSE', year=2)
+        fac_user = User.objects.create_user(username='fac_api', password='pass')
+        fac_user.groups.add(faculty_group)
+        self.faculty = FacultyProfile.objects.create(user=fac_user, employee_id='APIF', department='CSE', designation='Professor')
+        self.projects = [
+            Project.objects.create(student=self.student, title=f'API {i}', domain='AI', description='D')
+            for i in range(3)
+        ]
+
+    def test_requires_login_and_role(self):
+        self.assertEqual(self.client.get('/api/projects/').status_code, 401)
+        User.objects.create_user(username='nogroup', password='pass')
+        self.client.login(username='nogroup', password='pass')
+        self.assertEqual(self.client.get('/api/projects/').status_code, 403)
+
+    def test_list_fields_cursor_and_etag(self):
+        self.client.login(username='stud_api', password='pass')
+        resp = self.client.get('/api/projects/', {'fields': 'id,title', 'limit': 2})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data['results'], [{'id': p.id, 'title': p.title} for p in self.projects[:0:-1]])
+        self.assertIsNotNone(data['next_cursor'])
+
+        page2 = self.client.get('/api/projects/', {'fields': 'id', 'limit': 2, 'cursor': data['next_cursor']}).json()
+        self.assertEqual(page2, {'results': [{'id': self.projects[0].id}], 'next_cursor': None})
+
+        etag = resp['ETag']
+        again = self.client.get('/api/projects/', {'fields': 'id,title', 'limit': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+
+        self.projects[2].title = 'Renamed'
+        self.projects[2].save()
+        changed = self.client.get('/api/projects/', {'fields': 'id,title', 'limit': 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+
+    def test_faculty_review_via_patch_with_if_match(self):
+        project = self.projects[0]
+        self.client.login(username='fac_api', password='pass')
+        url = f'/api/projects/{project.id}/'
+        etag = self.client.get(url, {'fields': 'id,status'})['ETag']
+        resp = self.client.patch(url, {'status': Project.STATUS_APPROVED}, content_type='application/json', HTTP_IF_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()['status'], Project.STATUS_APPROVED)
+        self.assertEqual(resp.json()['faculty_reviewer'], self.faculty.id)
+
+        stale = self.client.patch(url, {'status': Project.STATUS_REJECTED}, content_type='application/json', HTTP_IF_MATCH=etag)
+        self.assertEqual(stale.status_code, 412)
+
+    def test_patch_body_is_never_silently_ignored(self):
+        project = self.projects[0]
+        self.client.login(username='fac_api', password='pass')
+        url = f'/api/projects/{project.id}/'
+        resp = self.client.patch(url, 'status=A&faculty_remarks=ok', content_type='application/x-www-form-urlencoded')
+        self.assertEqual(resp.json()['status'], Project.STATUS_APPROVED)
+        resp = self.client.patch(url, 'status=R', content_type='text/plain')
+        self.assertEqual(resp.status_code, 415)
+        # repeating the same decision does not add a history row
+        self.client.patch(url, {'status': 'A', 'faculty_remarks': 'ok'}, content_type='application/json')
+        self.assertEqual(ReviewEvent.objects.filter(project=project).count(), 1)
+
+    def test_student_cannot_review_and_can_submit(self):
+        self.client.login(username='stud_api', password='pass')
+        resp = self.client.patch(f'/api/projects/{self.projects[0].id}/', {'status': 'A'}, content_type='application/json')
+        self.assertEqual(resp.status_code, 403)
+        resp = self.client.post('/api/projects/', {'title': 'Via API', 'domain': 'Web', 'description': 'Submitted through the API'},
+                                content_type='application/json')
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.json()['faculty_reviewer'], self.faculty.id)
+
+    def test_profile_read_and_update(self):
+        self.client.login(username='stud_api', password='pass')
+        resp = self.client.get('/api/profile/', {'fields': 'username,year'})
+        self.assertEqual(resp.json(), {'username': 'stud_api', 'year': 2})
+        resp = self.client.patch('/api/profile/', {'year': 3, 'email': 'stud_api@example.com'}, content_type='application/json')
+        self.assertEqual((resp.json()['year'], resp.json()['email']), (3, 'stud_api@example.com'))
+        resp = self.client.patch('/api/profile/', {'email': 'not-an-address'}, content_type='application/json')
+        self.assertEqual(resp.status_code, 400)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ArchiveTest(TestCase):
+    def setUp(self):
+        student_group, _ = Group.objects.get_or_create(name='Student')
+        user = User.objects.create_user(username='stud_old', password='pass')
+        user.groups.add(student_group)
+        self.student = StudentProfile.objects.create(user=user, register_number='OLD1', department='CSE', year=4)
+        fac_user = User.objects.create_user(username='fac_old', password='pass')
+        self.faculty = FacultyProfile.objects.create(user=fac_user, employee_id='OLDF', department='CSE', designation='Professor')
+
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def test_archive_old_and_graduated_projects(self):
+        old = Project.objects.create(student=self.student, title='Old', domain='AI', description='D', faculty_reviewer=self.faculty)
+        old.attachment.save('old.txt', ContentFile(b'old'))
+        Project.objects.filter(pk=old.pk).update(submitted_at=timezone.now() - timedelta(days=800))
+        report = ProjectReport.objects.create(project=old, generated_by=self.faculty)
+        recent = Project.objects.create(student=self.student, title='Recent', domain='AI', description='D')
+
+        out = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('archive_projects', '--before', str((timezone.now() - timedelta(days=365)).date()), stdout=out)
+        self.assertIn('Archived 1 projects and 1 reports', out.getvalue())
+        self.assertFalse(Project.objects.filter(pk=old.pk).exists())
+        archived = ArchivedProject.objects.get(original_id=old.pk)
+        self.assertEqual(archived.faculty_reviewer_username, 'fac_old')
+        self.assertEqual(archived.reports.get().original_id, report.pk)
+        # the attachment is still referenced by the archive, so it is kept
+        self.assertTrue(default_storage.exists(archived.attachment.name))
+
+        self.student.graduated = True
+        self.student.save()
+        call_command('archive_projects', '--graduated', stdout=io.StringIO())
+        self.assertFalse(Project.objects.filter(pk=recent.pk).exists())
+
+        self.client.login(username='stud_old', password='pass')
+        data = self.client.get('/api/archive/projects/', {'fields': 'original_id,title,reports'}).json()
+        self.assertEqual([r['original_id'] for r in data['results']], [recent.pk, old.pk])
+        self.assertEqual(len(data['results'][1]['reports']), 1)
+
+    def test_admin_cannot_delete_archived_projects(self):
+        project = Project.objects.create(student=self.student, title='Kept', domain='AI', description='D')
+        archive_batch([project.pk])
+        archived = ArchivedProject.objects.get(original_id=project.pk)
+        User.objects.create_superuser(username='root_old', password='pass')
+        self.client.login(username='root_old', password='pass')
+        resp = self.client.post(f'/admin/core/archivedproject/{archived.pk}/delete/', {'post': 'yes'})
+        self.assertEqual(resp.status_code, 403)
+        self.assertTrue(ArchivedProject.objects.filter(pk=archived.pk).exists())
+
+
+class DashboardResponseTest(TestCase):
+    def setUp(self):
+        student_group, _ = Group.objects.get_or_create(name='Student')
+        user = User.objects.create_user(username='stud_etag', password='pass')
+        user.groups.add(student_group)
+        self.student = StudentProfile.objects.create(user=user, register_number='ETAG1', department='CSE', year=1)
+        self.project = Project.objects.create(student=self.student, title='Cached', domain='AI', description='D')
+        self.client.login(username='stud_etag', password='pass')
+
+    def test_repeat_view_is_not_modified_until_data_changes(self):
+        # the first visit sets the CSRF cookie, which is part of the ETag
+        self.client.get('/student/dashboard/')
+        first = self.client.get('/student/dashboard/')
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+
+        again = self.client.get('/student/dashboard/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+
+        self.project.status = Project.STATUS_APPROVED
+        self.project.save()
+        changed = self.client.get('/student/dashboard/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+
+    def test_dashboard_is_gzipped(self):
+        resp = self.client.get('/student/dashboard/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(resp['Content-Encoding'], 'gzip')
+        self.assertIn(b'Cached', gzip.decompress(resp.content))
+
+
+class SimilarityTest(TestCase):
+    def setUp(self):
+        Group.objects.get_or_create(name='Student')
+        faculty_group, _ = Group.objects.get_or_create(name='Faculty')
+        user = User.objects.create_user(username='stud_dup', password='pass')
+        self.student = StudentProfile.objects.create(user=user, register_number='DUP1', department='CSE', year=3)
+        other = User.objects.create_user(username='stud_dup2', password='pass')
+        self.other_student = StudentProfile.objects.create(user=other, register_number='DUP2', department='ECE', year=3)
+        fac_user = User.objects.create_user(username='fac_dup', password='pass')
+        fac_user.groups.add(faculty_group)
+        FacultyProfile.objects.create(user=fac_user, employee_id='DUPF', department='CSE', designation='Professor')
+
+    def _project(self, student, title, description):
+        project = Project.objects.create(student=student, title=title, domain='AI', description=description)
+        index_project(project)
+        return project
+
+    def test_near_duplicates_are_flagged(self):
+        text = 'A smart irrigation system that uses soil moisture sensors and weather forecasts to schedule watering'
+        original = self._project(self.other_student, 'Smart Irrigation', text)
+        copy = self._project(self.student, 'Smart Irrigation', text + ' automatically')
+        unrelated = self._project(self.student, 'Library Portal', 'An online portal for borrowing and returning library books')
+
+        duplicates = find_duplicates([copy.id, unrelated.id])
+        self.assertEqual([other for other, _ in duplicates[copy.id]], [original])
+        self.assertNotIn(unrelated.id, duplicates)
+
+        self.client.login(username='fac_dup', password='pass')
+        self.assertContains(self.client.get('/faculty/dashboard/'), 'Possible duplicate of')
+
+    def test_rebuild_matches_incremental_index(self):
+        project = self._project(self.student, 'Traffic Prediction', 'Predicting urban traffic congestion with graph networks')
+        before = bytes(ProjectSignature.objects.get(project_id=project.id).signature)
+        call_command('rebuild_similarity_index', stdout=io.StringIO())
+        self.assertEqual(bytes(ProjectSignature.objects.get(project_id=project.id).signature), before)
+        self.assertEqual(LSHBucket.objects.filter(project_id=project.id).count(), BANDS)
+
+    @unittest.skipUnless(importlib.util.find_spec('numpy'), 'NumPy not installed')
+    def test_vectorized_signatures_match_pure_python(self):
+        texts = [
+            'Predicting urban traffic congestion with graph networks',
+            '',
+            'short',
+            'A smart irrigation system that uses soil moisture sensors and weather forecasts',
+            'Café menu ordering app – offline first, with sync',
+        ]
+        vectorized = similarity.batch_signature_function()
+        self.assertIsNot(vectorized, similarity.compute_signatures)
+        self.assertEqual(vectorized(texts), similarity.compute_signatures(texts))
+
+    def test_archived_projects_are_still_flagged(self):
+        text = 'Detecting plant leaf diseases from smartphone photos with a convolutional network'
+        old = self._project(self.other_student, 'Leaf Disease Detection', text)
+        archive_batch([old.id])
+        call_command('rebuild_similarity_index', stdout=io.StringIO())
+        copy = self._project(self.student, 'Leaf Disease Detection', text)
+        matches = find_duplicates([copy.id])[copy.id]
+        self.assertEqual([(type(other), other.original_id) for other, _ in matches], [(ArchivedProject, old.id)])
+
+        deleted = self._project(self.student, 'Gone', 'A project that is deleted outright')
+        deleted.delete()
+        self.assertFalse(LSHBucket.objects.filter(project_id=deleted.id).exists())
+
+    def test_index_state_ignores_unrelated_submissions(self):
+        project = self._project(self.student, 'Weather Station', 'A solar powered weather station reporting over LoRa')
+        before = index_state([project.id])
+        self._project(self.other_student, 'Chess Engine', 'A bitboard chess engine with alpha beta search')
+        self.assertEqual(index_state([project.id]), before)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AdmissionControlTest(TestCase):
+    def setUp(self):
+        faculty_group, _ = Group.objects.get_or_create(name='Faculty')
+        fac_user = User.objects.create_user(username='fac_adm', password='pass')
+        fac_user.groups.add(faculty_group)
+        self.faculty = FacultyProfile.objects.create(user=fac_user, employee_id='ADMF', department='CSE', designation='Professor')
+        user = User.objects.create_user(username='stud_adm', password='pass')
+        student = StudentProfile.objects.create(user=user, register_number='ADM1', department='CSE', year=2)
+        self.project = Project.objects.create(student=student, title='Busy', domain='AI', description='D')
+        self.url = f'/project/{self.project.id}/generate_report/'
+        self.client.login(username='fac_adm', password='pass')
+        # counters are buffered per process; drop anything earlier tests left behind
+        admission.reset_stats('generate_report')
+
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    @override_settings(ADMISSION_CONTROL={'generate_report': {'concurrency': 1, 'retry_after': 7}})
+    def test_busy_endpoint_answers_503(self):
+        slot = admission.acquire_slot('generate_report', 1, 60)
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp['Retry-After'], '7')
+        admission.release_slot(slot)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        stats = admission.stats('generate_report')
+        self.assertEqual((stats['admitted'], stats['rejected_busy'], stats['in_flight']), (1, 1, 0))
+
+    @override_settings(ADMISSION_METRICS_FLUSH_SECONDS=3600)
+    def test_rejections_do_not_write(self):
+        admission.flush_metrics()
+        slot = admission.acquire_slot('generate_report', 2, 60)
+        other = admission.acquire_slot('generate_report', 2, 60)
+        # one read of the slot keys, no failing INSERTs, no counter UPDATE
+        with self.assertNumQueries(1):
+            self.assertIsNone(admission.acquire_slot('generate_report', 2, 60))
+            admission.record('generate_report', 'rejected_busy')
+        admission.release_slot(slot)
+        admission.release_slot(other)
+        self.assertEqual(admission.stats('generate_report')['rejected_busy'], 1)
+
+    @override_settings(ADMISSION_CONTROL={'generate_report': {'concurrency': 5, 'rate': 0.1, 'burst': 1}})
+    def test_per_user_rate_limit_answers_429(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, 429)
+        self.assertGreaterEqual(int(resp['Retry-After']), 1)
+        self.assertEqual(admission.stats('generate_report')['rejected_rate'], 1)
+        admission.reset_stats('generate_report')
+        self.assertEqual(admission.stats('generate_report')['admitted'], 0)
+
+
+class ChangeFeedTest(TestCase):
+    def setUp(self):
+        admin_group, _ = Group.objects.get_or_create(name='Admin')
+        self.admin = User.objects.create_user(username='sync_bot', password='pass')
+        self.admin.groups.add(admin_group)
+        user = User.objects.create_user(username='stud_cdc', password='pass')
+        self.student = StudentProfile.objects.create(user=user, register_number='CDC1', department='CSE', year=2)
+        fac_user = User.objects.create_user(username='fac_cdc', password='pass')
+        self.faculty = FacultyProfile.objects.create(user=fac_user, employee_id='CDCF', department='CSE', designation='Professor')
+
+    def test_signals_append_events(self):
+        project = Project.objects.create(student=self.student, title='CDC', domain='AI', description='D')
+        project.status = Project.STATUS_APPROVED
+        project.faculty_remarks = 'Nice'
+        project.faculty_reviewer = self.faculty
+        project.save()
+        project.domain = 'ML'
+        project.save()
+        ProjectReport.objects.create(project=project, generated_by=self.faculty)
+        types = list(ChangeEvent.objects.values_list('event_type', flat=True))
+        self.assertEqual(types, ['project.created', 'project.status_changed', 'project.remarks_changed', 'report.created'])
+        status_event = ChangeEvent.objects.get(event_type='project.status_changed')
+        self.assertEqual(status_event.payload, {'old': 'P', 'new': 'A', 'reviewer': self.faculty.id})
+
+    def test_feed_endpoint_and_consumer_cursor(self):
+        for i in range(3):
+            Project.objects.create(student=self.student, title=f'CDC {i}', domain='AI', description='D')
+        self.client.login(username='sync_bot', password='pass')
+        page = self.client.get('/api/changes/', {'consumer': 'grades', 'limit': 2}).json()
+        self.assertEqual(len(page['events']), 2)
+        self.assertTrue(page['has_more'])
+        self.client.post('/api/changes/', {'consumer': 'grades', 'position': page['next_after']}, content_type='application/json')
+        rest = self.client.get('/api/changes/', {'consumer': 'grades'}).json()
+        self.assertEqual([e['payload']['title'] for e in rest['events']], ['CDC 2'])
+
+        out = io.StringIO()
+        call_command('consume_changes', 'analytics', stdout=out, stderr=io.StringIO())
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+        self.assertEqual(ChangeFeedCursor.objects.get(consumer='analytics').position, rest['next_after'])
+
+    def test_archival_is_not_reported_as_deletion(self):
+        archived = Project.objects.create(student=self.student, title='Archived', domain='AI', description='D')
+        deleted = Project.objects.create(student=self.student, title='Deleted', domain='AI', description='D')
+        deleted_id = deleted.id
+        archive_batch([archived.id])
+        deleted.delete()
+        events = ChangeEvent.objects.exclude(event_type='project.created').values_list('event_type', 'project_id')
+        self.assertEqual(list(events), [('project.archived', archived.id), ('project.deleted', deleted_id)])
+
+    def test_feed_requires_admin_group_and_compaction(self):
+        self.client.login(username='stud_cdc', password='pass')
+        self.assertEqual(self.client.get('/api/changes/').status_code, 403)
+        Project.objects.create(student=self.student, title='Old event', domain='AI', description='D')
+        ChangeEvent.objects.update(created_at=timezone.now() - timedelta(days=60))
+        call_command('compact_changes', stdout=io.StringIO())
+        self.assertFalse(ChangeEvent.objects.exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ReviewHistoryTest(TestCase):
+    def setUp(self):
+        faculty_group, _ = Group.objects.get_or_create(name='Faculty')
+        fac_user = User.objects.create_user(username='fac_hist', password='pass')
+        fac_user.groups.add(faculty_group)
+        self.faculty = FacultyProfile.objects.create(user=fac_user, employee_id='HISTF', department='CSE', designation='Professor')
+        user = User.objects.create_user(username='stud_hist', password='pass')
+        student = StudentProfile.objects.create(user=user, register_number='HIST1', department='CSE', year=2)
+        self.project = Project.objects.create(
+            student=student, title='History', domain='AI', description='D', faculty_reviewer=self.faculty,
+        )
+        self.client.login(username='fac_hist', password='pass')
+
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def test_review_appends_event_in_same_transaction(self):
+        for status, remarks in (('R', 'Needs scope'), ('A', 'Good now')):
+            resp = self.client.patch(
+                f'/api/projects/{self.project.id}/', {'status': status, 'faculty_remarks': remarks},
+                content_type='application/json',
+            )
+            self.assertEqual(resp.status_code, 200)
+        events = list(ReviewEvent.objects.filter(project=self.project))
+        self.assertEqual([(e.status, e.remarks) for e in events], [('A', 'Good now'), ('R', 'Needs scope')])
+        self.assertEqual({e.faculty_id for e in events}, {self.faculty.id})
+
+    def test_timeline_pages_with_cursor(self):
+        base = timezone.now()
+        for i in range(5):
+            # two events share a timestamp to exercise the id tie-breaker
+            record_review(self.project, reviewed_at=base + timedelta(minutes=i // 2))
+        seen = []
+        cursor = None
+        for _ in range(3):
+            params = {'limit': 2, 'cursor': cursor} if cursor else {'limit': 2}
+            page = self.client.get(f'/api/projects/{self.project.id}/history/', params).json()
+            seen += [e['id'] for e in page['results']]
+            cursor = page['next_cursor']
+        self.assertIsNone(cursor)
+        self.assertEqual(seen, list(ReviewEvent.objects.values_list('id', flat=True)))
+        faculty_page = self.client.get(f'/api/faculty/{self.faculty.id}/history/').json()
+        self.assertEqual(len(faculty_page['results']), 5)
+
+    def test_backfill_from_generated_reports(self):
+        self.project.status = Project.STATUS_APPROVED
+        self.project.faculty_remarks = 'Solid (plan)\nKeep going'
+        self.project.save()
+        self.client.get(f'/project/{self.project.id}/generate_report/')
+        self.client.get(f'/project/{self.project.id}/generate_report/')
+        call_command('backfill_review_history', stdout=io.StringIO())
+        call_command('backfill_review_history', stdout=io.StringIO())
+        event = ReviewEvent.objects.get()
+        self.assertEqual(event.source, ReviewEvent.SOURCE_BACKFILL)
+        self.assertEqual((event.status, event.remarks), ('A', 'Solid (plan)\nKeep going'))
+        self.assertEqual(event.faculty_id, self.faculty.id)
+
+        # reports taken after live history starts never become backfilled events
+        self.client.patch(
+            f'/api/projects/{self.project.id}/', {'status': 'R', 'faculty_remarks': 'Reconsidered'},
+            content_type='application/json',
+        )
+        self.client.get(f'/project/{self.project.id}/generate_report/')
+        call_command('backfill_review_history', stdout=io.StringIO())
+        self.assertEqual(
+            list(ReviewEvent.objects.values_list('source', 'status')),
+            [(ReviewEvent.SOURCE_REVIEW, 'R'), (ReviewEvent.SOURCE_BACKFILL, 'A')],
+        )
+
+    def test_history_of_archived_project_stays_reachable(self):
+        record_review(self.project)
+        project_id = self.project.id
+        archive_batch([project_id])
+        page = self.client.get(f'/api/projects/{project_id}/history/').json()
+        self.assertEqual([e['project'] for e in page['results']], [project_id])
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, api
 
 urlpatterns = [
     # Root — redirect to login page
@@ -16,4 +16,16 @@ urlpatterns = [
     path('student/dashboard/', views.student_dashboard, name='student_dashboard'),
     path('faculty/dashboard/', views.faculty_dashboard, name='faculty_dashboard'),
     path('project/<int:project_id>/generate_report/', views.generate_report, name='generate_report'),
+
+    # JSON API
+    path('api/projects/', api.project_list, name='api_project_list'),
+    path('api/projects/<int:project_id>/', api.project_detail, name='api_project_detail'),
+    path('api/projects/<int:project_id>/history/', api.project_history, name='api_project_history'),
+    path('api/faculty/<int:faculty_id>/history/', api.faculty_history, name='api_faculty_history'),
+    path('api/reports/', api.report_list, name='api_report_list'),
+    path('api/reports/<int:report_id>/', api.report_detail, name='api_report_detail'),
+    path('api/profile/', api.profile_detail, name='api_profile'),
+    path('api/archive/projects/', api.archived_project_list, name='api_archived_project_list'),
+    path('api/archive/projects/<int:archived_id>/', api.archived_project_detail, name='api_archived_project_detail'),
+    path('api/changes/', api.change_feed, name='api_change_feed'),
 ]
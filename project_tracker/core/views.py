@@ -5,19 +5,26 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpResponse, FileResponse
 import os
+from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
+from django.core.validators import validate_email
 from django.urls import reverse
 from .models import StudentProfile, FacultyProfile, Project, ProjectReport
 from .forms import ProjectSubmissionForm, ProjectReviewForm
-from .decorators import group_required
+from django.db.models import Count, Max
+from .decorators import group_required, conditional_page
+from .middleware import compress_page
+from .admission import admission_control
+from .assignment import assign_reviewer, review_queue
+from .similarity import find_duplicates, index_project, index_state
 
 import io
-from reportlab.pdfgen import canvas
 
 
 
 # ========== REGISTRATION VIEWS ==========
 
+@compress_page
 def student_register(request):
     """
     Handle student registration.
@@ -26,15 +33,23 @@ def student_register(request):
     if request.method == 'POST':
         username = request.POST.get('username')
         password = request.POST.get('password')
+        email = (request.POST.get('email') or '').strip()
         register_number = request.POST.get('register_number')
         department = request.POST.get('department')
         year = request.POST.get('year')
 
         # Validate required fields
-        if not all([username, password, register_number, department, year]):
+        if not all([username, password, email, register_number, department, year]):
             messages.error(request, "All fields are required!")
             return redirect('student_register')
 
+        # Review notifications are emailed, so the address must be usable
+        try:
+            validate_email(email)
+        except ValidationError:
+            messages.error(request, "Enter a valid email address!")
+            return redirect('student_register')
+
         # Check if username already exists
         if User.objects.filter(username=username).exists():
             messages.error(request, "Username already exists!")
@@ -47,7 +62,7 @@ def student_register(request):
 
         try:
             # Create User
-            user = User.objects.create_user(username=username, password=password)
+            user = User.objects.create_user(username=username, password=password, email=email)
 
             # Get or create 'Student' group
             student_group, created = Group.objects.get_or_create(name='Student')
@@ -71,6 +86,7 @@ def student_register(request):
     return render(request, 'student_register.html')
 
 
+@compress_page
 def faculty_register(request):
     """
     Handle faculty registration.
@@ -126,6 +142,7 @@ def faculty_register(request):
 
 # ========== LOGIN & LOGOUT VIEWS ==========
 
+@compress_page
 def login_view(request):
     """
     Common login page for both students and faculty.
@@ -175,7 +192,55 @@ def logout_view(request):
 
 # ========== DASHBOARD VIEWS ==========
 
+def _latest(*values):
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+def student_page_state(request):
+    """
+    Summarise what the student dashboard shows (profile + own projects) in a
+    single aggregate query, for conditional GET.
+    """
+    row = (
+        StudentProfile.objects.filter(user=request.user)
+        .annotate(projects_changed=Max('projects__updated_at'), project_count=Count('projects'))
+        .values_list('updated_at', 'projects_changed', 'project_count')
+        .first()
+    )
+    if row is None:
+        return None
+    profile_changed, projects_changed, project_count = row
+    return _latest(profile_changed, projects_changed), (project_count,)
+
+
+def faculty_page_state(request):
+    """
+    Summarise what the faculty dashboard shows (profile, review queue and its
+    reports) for conditional GET, without building the page.
+    """
+    faculty_profile = FacultyProfile.objects.filter(user=request.user).first()
+    if faculty_profile is None:
+        return None
+    queue_projects = review_queue(faculty_profile)
+    queue = queue_projects.aggregate(
+        projects_changed=Max('updated_at'),
+        project_count=Count('id', distinct=True),
+        reports_changed=Max('reports__generated_at'),
+        report_count=Count('reports', distinct=True),
+    )
+    # duplicate flags can point at projects outside the queue, but only at
+    # ones sharing an LSH bucket with a queued project
+    index_changed, index_count = index_state(queue_projects.values('id'))
+    last_modified = _latest(
+        faculty_profile.updated_at, queue['projects_changed'], queue['reports_changed'], index_changed,
+    )
+    return last_modified, (queue['project_count'], queue['report_count'], index_count)
+
+
 @group_required('Student')
+@compress_page
+@conditional_page(student_page_state)
 def student_dashboard(request):
     """
     Student dashboard - accessible only to users in 'Student' group.
@@ -197,6 +262,10 @@ def student_dashboard(request):
             proj = form.save(commit=False)
             proj.student = student_profile
             proj.save()
+            # hand the submission to the least loaded reviewer of the department
+            assign_reviewer(proj)
+            # keep the near-duplicate index current
+            index_project(proj)
             return redirect('student_dashboard')
     else:
         form = ProjectSubmissionForm()
@@ -211,6 +280,8 @@ def student_dashboard(request):
 
 
 @group_required('Faculty')
+@compress_page
+@conditional_page(faculty_page_state)
 def faculty_dashboard(request):
     """
     Faculty dashboard - accessible only to users in 'Faculty' group.
@@ -224,29 +295,30 @@ def faculty_dashboard(request):
         messages.error(request, "Faculty profile not found!")
         return redirect('login')
 
-    # show projects pending review
-    projects = Project.objects.all().order_by('-submitted_at')
+    # show projects assigned to this faculty member plus unassigned ones from their department
+    projects = review_queue(faculty_profile).order_by('-submitted_at')
 
     # optional review handling
     if request.method == 'POST':
         pid = request.POST.get('project_id')
         try:
-            project = Project.objects.get(pk=pid)
-        except Project.DoesNotExist:
+            project = review_queue(faculty_profile).get(pk=pid)
+        except (Project.DoesNotExist, ValueError):
             messages.error(request, 'Project not found')
             return redirect('faculty_dashboard')
 
         review_form = ProjectReviewForm(request.POST, instance=project)
         if review_form.is_valid():
-            proj = review_form.save(commit=False)
-            proj.faculty_reviewer = faculty_profile
-            if proj.status != Project.STATUS_PENDING:
-                from django.utils import timezone
-                proj.reviewed_at = timezone.now()
-            proj.save()
+            review_form.save_review(faculty_profile)
             messages.success(request, 'Project updated')
             return redirect('faculty_dashboard')
 
+    # flag submissions that closely resemble other projects (any year/department)
+    projects = list(projects)
+    duplicates = find_duplicates(p.id for p in projects)
+    for p in projects:
+        p.possible_duplicates = duplicates.get(p.id, [])
+
     review_form = ProjectReviewForm()
     context = {
         'faculty': faculty_profile,
@@ -258,6 +330,7 @@ def faculty_dashboard(request):
 
 
 @group_required('Faculty')
+@admission_control('generate_report')
 def generate_report(request, project_id):
     """
     Generate a simple PDF report for a project, save it to ProjectReport.
@@ -271,6 +344,10 @@ def generate_report(request, project_id):
         messages.error(request, 'Invalid request')
         return redirect('faculty_dashboard')
 
+    # ReportLab is heavy to import; load it only when a report is generated
+    # so worker start-up does not pay for it (see `manage.py profile_startup`)
+    from reportlab.pdfgen import canvas
+
     buffer = io.BytesIO()
     p = canvas.Canvas(buffer)
     p.setFont('Helvetica', 14)
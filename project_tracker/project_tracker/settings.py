@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.routers.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -67,6 +68,50 @@ DATABASES = {
     }
 }
 
+# Optional read replica: a local SQLite copy of the primary, refreshed with
+# `python manage.py refresh_replica`. Enable by pointing DJANGO_READ_REPLICA
+# at the replica file; relative paths are taken from BASE_DIR, like the
+# primary. Reads stay on the primary until the replica has been refreshed.
+READ_REPLICA_PATH = os.environ.get('DJANGO_READ_REPLICA')
+if READ_REPLICA_PATH:
+    READ_REPLICA_PATH = BASE_DIR / READ_REPLICA_PATH
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': READ_REPLICA_PATH,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.routers.PrimaryReplicaRouter']
+DATABASE_READ_ALIAS = 'replica' if READ_REPLICA_PATH else None
+# Apps whose reads may be served by the replica (sessions/auth stay on primary)
+REPLICA_READ_APPS = ['core']
+# After a write, the same client reads from the primary for this many seconds
+REPLICA_PIN_SECONDS = 10
+
+# Caches. The admission cache must be shared by every worker process, so it
+# lives in the database (create it with `python manage.py createcachetable`).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'admission': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'core_admission_cache',
+    },
+}
+
+# Admission control for expensive endpoints (see core/admission.py):
+# concurrency = max simultaneous requests across all workers,
+# rate/burst = per-user token bucket (requests per second / bucket size),
+# lease_seconds = how long a slot survives a crashed worker,
+# retry_after = Retry-After sent with 503 responses.
+ADMISSION_CACHE_ALIAS = 'admission'
+ADMISSION_CONTROL = {
+    'generate_report': {'concurrency': 2, 'rate': 0.2, 'burst': 3, 'lease_seconds': 60, 'retry_after': 5},
+}
+# Admitted/rejected counters are buffered per worker and written this often
+ADMISSION_METRICS_FLUSH_SECONDS = 10
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -105,9 +150,50 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are sharded into hashed subdirectories (see core/storage.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'core.storage.ShardedFileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Email: printed to the console in development. Notifications are queued in
+# the outbox and delivered by `python manage.py drain_outbox`.
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'noreply@project-tracker.local'
+OUTBOX_BATCH_SIZE = 200
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BASE_SECONDS = 60
+OUTBOX_RETRY_MAX_SECONDS = 3600
+# How long a worker owns a claimed batch before others may retry it
+OUTBOX_LEASE_SECONDS = 300
+
+# HTML pages are compressed once they reach this many bytes (brotli if the
+# optional `brotli` package is installed and the client accepts it, else gzip)
+COMPRESSION_MIN_SIZE = 1024
+BROTLI_QUALITY = 5
+
+# Projects whose estimated title/description similarity reaches this are
+# flagged as possible duplicates on the faculty dashboard
+SIMILARITY_THRESHOLD = 0.5
+
+# Change feed (see core/changefeed.py): events per read, and how long events
+# are kept before `python manage.py compact_changes` removes them
+CHANGE_FEED_BATCH_SIZE = 500
+CHANGE_FEED_MAX_BATCH_SIZE = 5000
+CHANGE_FEED_RETENTION_DAYS = 30
+
+# Worker cold start budget checked by `python manage.py profile_startup`,
+# and heavy modules that must not be imported until a view needs them
+STARTUP_BUDGET_MS = 3000
+STARTUP_LAZY_MODULES = ['reportlab', 'numpy']
+
 # Login settings
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = '/'